@@ -15,9 +15,13 @@ from modules.news import (
 )
 from modules.ai_logic import (
     extract_keywords, summarize_sentences,
-    make_theme_report, pick_promising_by_theme_once, save_report_and_picks,
+    make_theme_report, pick_promising_by_theme_once, save_report_and_picks, export_report_and_picks,
 )
 from modules.analyzer import init_db, analyze_stock, load_recent
+from modules.indicators import safe_indicators
+from modules.news_index import NewsIndex, parse_query
+from modules import metrics
+from modules.cache import cached, refresh as refresh_cache
 
 # ---- 공통 설정 ----
 KST = timezone(timedelta(hours=9))
@@ -28,24 +32,52 @@ st.markdown(inject_base_css(), unsafe_allow_html=True)
 st.markdown(render_quick_menu(), unsafe_allow_html=True)
 st.markdown("<div class='compact'>", unsafe_allow_html=True)
 
+# ---- (선택) 메트릭: NEWS_METRICS_PORT 지정 시 로컬 /metrics 엔드포인트 기동 ----
+if os.environ.get("NEWS_METRICS_PORT"):
+    try:
+        metrics.serve(int(os.environ["NEWS_METRICS_PORT"]))
+    except Exception:
+        pass
+
 if "__autosaved_once__" not in st.session_state:
     st.session_state["__autosaved_once__"] = False
 
-# ---- 캐시 안전 래퍼 ----
-@st.cache_data(ttl=600)
+# ---- 캐시 안전 래퍼 (공유 캐시 백엔드: NEWS_CACHE_BACKEND) ----
+@cached("news")
 def _safe_fetch_category_news(cat, days=3, max_items=100):
     try:
         return fetch_category_news(cat, days=days, max_items=max_items)
     except Exception:
         return []
 
-@st.cache_data(ttl=600)
+@cached("news")
 def _safe_fetch_all_news(days=3, per_cat=100):
     try:
         return fetch_all_news(days=days, per_cat=per_cat)
     except Exception:
         return []
 
+# ---- (선택) 공유 스냅샷 API: NEWS_API_URL 지정 시 업스트림 대신 이 서비스를 조회 ----
+@st.cache_resource
+def _snapshot_client(url: str):
+    from modules.snapshot_client import SnapshotClient
+    return SnapshotClient(url)  # 프로세스당 1개 → ETag 캐시 공유
+
+_api = _snapshot_client(os.environ["NEWS_API_URL"]) if os.environ.get("NEWS_API_URL") else None
+
+def _via_api(getter, default):
+    try:
+        return getter(_api)
+    except Exception:
+        return default
+
+# ---- 테마/키워드 역색인 (프로세스 공유, 새로고침마다 새 기사만 증분 추가) ----
+@st.cache_resource
+def _news_index():
+    return NewsIndex()
+
+news_index = _news_index()
+
 # =========================
 # 0) 헤더 & 리프레시
 # =========================
@@ -55,12 +87,13 @@ with c1:
     st.caption(datetime.now(KST).strftime("업데이트: %Y-%m-%d %H:%M:%S (KST)"))
 with c2:
     if st.button("🔄 새로고침", use_container_width=True):
+        refresh_cache("news", "quotes")  # 공유 캐시는 비우지 않고 이 프로세스만 다시 받아 덮어씀
         st.cache_data.clear(); st.rerun()
 
 # =========================
 # 1) 티커바
 # =========================
-items = build_ticker_items()
+items = _via_api(lambda a: a.ticker_items(), []) if _api else build_ticker_items()
 chips = []
 for it in items:
     arrow = "▲" if it["is_up"] else ("▼" if it["is_down"] else "•")
@@ -89,7 +122,7 @@ with col1:
 with col2:
     page = st.number_input("페이지", min_value=1, value=1, step=1)
 
-news_all = _safe_fetch_category_news(cat, days=3, max_items=100)
+news_all = _via_api(lambda a: a.category_news(cat), []) if _api else _safe_fetch_category_news(cat, days=3, max_items=100)
 page_size = 10
 start, end = (page-1)*page_size, page*page_size
 for i, n in enumerate(news_all[start:end], start=start+1):
@@ -109,8 +142,18 @@ st.divider()
 # 3) 뉴스 기반 테마
 # =========================
 st.markdown("<h2 id='sec-themes'>🔥 뉴스 기반 테마 요약</h2>", unsafe_allow_html=True)
-all_news = _safe_fetch_all_news(days=3, per_cat=100)
-theme_rows = detect_themes(all_news)
+if _api:
+    theme_rows = _via_api(lambda a: a.themes(), [])
+    quotes = _via_api(lambda a: a.quotes(), {})
+    try:
+        news_index.add(_via_api(lambda a: a.all_news(), []))
+    except Exception:
+        pass
+else:
+    all_news = _safe_fetch_all_news(days=3, per_cat=100)
+    with metrics.timer("pipeline_stage_seconds", stage="detect"):
+        theme_rows = detect_themes(all_news, index=news_index)
+    quotes = None  # 직접 조회
 
 if not theme_rows:
     st.info("테마 신호가 약합니다. (네트워크 차단/빈 데이터일 수 있어요)")
@@ -125,7 +168,7 @@ else:
 
     st.markdown("### 🧩 대표 종목 시세 (상승=빨강 / 하락=파랑)")
     def _repr_price(ticker: str):
-        last, prev, _ = fetch_quote(ticker)
+        last, prev, _ = quotes.get(ticker, (None, None, None)) if quotes is not None else fetch_quote(ticker)
         if not last or not prev:
             return "-", "-", "gray"
         delta = (last - prev) / prev * 100.0
@@ -144,13 +187,40 @@ else:
                 st.markdown(f"<b>{name}</b><br><span style='color:{color}'>{px} {chg}</span><br><small>{ticker}</small>", unsafe_allow_html=True)
         st.markdown("<hr/>", unsafe_allow_html=True)
 
+    # ---- 드릴다운: 테마 + 키워드 AND 검색 (역색인 조회, 최신순 top-k) ----
+    with st.expander("🔎 테마 · 키워드 드릴다운", expanded=False):
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c1:
+            dd_theme = st.selectbox("테마", ["(전체)"] + [r["theme"] for r in theme_rows])
+        with c2:
+            dd_query = st.text_input("키워드 (AND)", placeholder="예: 수출 AND 미국")
+        with c3:
+            dd_hours = st.selectbox("기간", [24, 72], format_func=lambda h: f"최근 {h}시간")
+        terms = ([] if dd_theme == "(전체)" else [dd_theme]) + parse_query(dd_query)
+        since = datetime.now(KST) - timedelta(hours=dd_hours)
+        hits = news_index.search(terms, since=since, k=20)
+        st.caption(f"{news_index.count(terms, since=since)}건 중 최신 {len(hits)}건")
+        if dd_theme != "(전체)":
+            for sent in news_index.theme_summary(dd_theme, n_sent=3):
+                st.write(f"• {sent}")
+        for n in hits:
+            st.markdown(f"- [{n['title']}]({n['link']}) <small>{n['time']}</small>", unsafe_allow_html=True)
+
 st.divider()
 
 # =========================
 # 4) AI 유망 종목 Top5
 # =========================
 st.markdown("<h2 id='sec-top5'>🚀 오늘의 AI 유망 종목 Top5 (테마다 1종목)</h2>", unsafe_allow_html=True)
-rec_df = pick_promising_by_theme_once(theme_rows, THEME_STOCKS, top_n=5) if theme_rows else pd.DataFrame()
+indicators = None  # 기술적 지표 (THEME_STOCKS 전체, 마감된 거래일 단위 캐시) - 실패 시 지표 없이 점수 계산
+if _api:
+    rec_df = pd.DataFrame(_via_api(lambda a: a.picks(), []))
+else:
+    with metrics.timer("pipeline_stage_seconds", stage="indicators"):
+        indicators = safe_indicators() if theme_rows else None
+    with metrics.timer("pipeline_stage_seconds", stage="score"):
+        rec_df = pick_promising_by_theme_once(theme_rows, THEME_STOCKS, top_n=5, indicators=indicators) \
+            if theme_rows else pd.DataFrame()
 if rec_df.empty:
     st.info("추천할 종목이 없습니다. (유동성/이상치 필터로 제외됐을 수 있어요)")
 else:
@@ -192,7 +262,13 @@ def _render_downloads(paths: dict):
 def _do_save(prefix: str = "export") -> dict:
     if not theme_rows:
         raise RuntimeError("저장할 테마 데이터가 없습니다.")
-    return save_report_and_picks(theme_rows, THEME_STOCKS, out_dir="reports", top_n=5, prefix=prefix)
+    if _api:
+        # 화면에 보인 API 픽 그대로 + API 시세로 만든 테마 리포트 (빠진 시세는 빈 값 - Yahoo로 직접 폴백하지 않음)
+        api_quotes = {t: quotes.get(t, (None, None, None)) for stocks in THEME_STOCKS.values() for _, t in stocks}
+        return export_report_and_picks(make_theme_report(theme_rows, THEME_STOCKS, quotes=api_quotes), rec_df,
+                                       out_dir="reports", prefix=prefix)
+    return save_report_and_picks(theme_rows, THEME_STOCKS, out_dir="reports", top_n=5, prefix=prefix,
+                                 quotes=quotes, indicators=indicators)
 
 st.markdown("### 🪄 한번에 분석+추천+저장")
 cc1, cc2 = st.columns([1, 2])
@@ -246,4 +322,25 @@ if hist.empty:
 else:
     st.dataframe(hist, use_container_width=True, hide_index=True)
 
+# =========================
+# 7) (선택) 관리자 · 메트릭 패널  (NEWS_ADMIN=1 또는 ?admin=1)
+# =========================
+if os.environ.get("NEWS_ADMIN") or st.query_params.get("admin"):
+    st.divider()
+    st.markdown("## 🛠️ 관리자 · 메트릭")
+    on = st.toggle("메트릭 수집", value=metrics.is_enabled())
+    if on != metrics.is_enabled():
+        metrics.enable(on); st.rerun()
+    rows = metrics.snapshot()
+    if not rows:
+        st.info("수집된 메트릭이 없습니다. (NEWS_METRICS=1 또는 위 토글로 켜기)")
+    else:
+        df_m = pd.DataFrame(rows)
+        df_m["labels"] = df_m["labels"].apply(lambda d: ", ".join(f"{k}={v}" for k, v in d.items()))
+        st.dataframe(df_m, use_container_width=True, hide_index=True)
+        with st.expander("Prometheus 텍스트"):
+            st.code(metrics.render_prometheus(), language="text")
+    if st.button("메트릭 초기화"):
+        metrics.reset(); st.rerun()
+
 st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# benchmarks/backtest_parity.py
+# 백테스트 select()와 실서비스 규칙(pick_promising_by_theme_once)의 픽 일치 검사 (오프라인, 합성 데이터)
+#
+#   python -m benchmarks.backtest_parity                    # 불일치가 있으면 exit 1
+#   python -m benchmarks.backtest_parity --days 120 --seed 3
+#
+# 매일 같은 입력(테마 건수 · 감지 순서 · 시세 · 지표)으로 두 규칙을 돌려 (티커, AI점수) 목록을 순서까지 비교한다.
+# - 건수는 작은 범위에서 뽑아 동률 테마가 많고, 감지 순서는 날마다 섞는다 (동률 순서 검사)
+# - 이상치 · 저거래량 · 가격 결측을 일부 넣어 필터 경로도 함께 검사
+# - 지표 모드는 그날까지의 가격으로 계산한 Indicators를 실서비스 쪽에 넘긴다
+
+from __future__ import annotations
+import argparse
+import sys
+from typing import Dict, List, Tuple
+
+from benchmarks import corpora
+
+
+def _synthetic(n_tickers: int, n_days: int, seed: int):
+    import numpy as np
+    from modules.indicators import build_panel
+
+    stocks = corpora.make_theme_stocks(n_tickers, seed=seed)
+    tickers = list(dict.fromkeys(t for v in stocks.values() for _, t in v))
+    panel = build_panel({t: corpora.make_ohlc(n_days, seed=seed * 100_003 + i) for i, t in enumerate(tickers)})
+    rng = np.random.default_rng(seed)
+    shape = panel.close.shape
+    panel.close[rng.random(shape) < 0.01] *= 1.5                   # 이상치 (OUTLIER_DROP 초과)
+    panel.volume[rng.random(shape) < 0.05] = 10_000                # MIN_VOLUME 미만
+    panel.close[rng.random(shape) < 0.01] = np.nan                 # 가격 결측
+    themes = sorted(stocks)
+    counts = rng.integers(0, 6, size=(len(panel), len(themes))).astype(float)
+    return stocks, panel, themes, counts, rng
+
+
+def _theme_rows(themes: List[str], counts_row, rng) -> Tuple[List[Dict], List[float]]:
+    """detect_themes와 같은 모양: 감지 순서(무작위) → 건수 내림차순 안정 정렬. → (theme_rows, 테마별 pos)"""
+    detected = [themes[k] for k in rng.permutation(len(themes)) if counts_row[k] > 0]
+    rows = [{"theme": t, "count": int(counts_row[themes.index(t)])} for t in detected]
+    rows.sort(key=lambda x: x["count"], reverse=True)
+    pos = {r["theme"]: i for i, r in enumerate(rows)}
+    return rows, [float(pos.get(t, len(themes))) for t in themes]
+
+
+def check(n_tickers: int = 60, n_days: int = 160, days: int = 60, seed: int = 0,
+          tech: bool = True) -> List[str]:
+    """불일치 설명 목록 (빈 목록 = 일치)"""
+    import math
+    import numpy as np
+    from modules import backtest
+    from modules.ai_logic import pick_promising_by_theme_once
+    from modules.indicators import Panel, compute
+
+    stocks, panel, themes, counts, rng = _synthetic(n_tickers, n_days, seed)
+    first = max(1, len(panel) - days)
+    pos = np.full(counts.shape, np.inf)
+    live: Dict[int, List[Tuple[str, float]]] = {}
+    for d in range(first, len(panel)):
+        rows, pos[d] = _theme_rows(themes, counts[d], rng)
+        quotes = {}
+        for j, t in enumerate(panel.tickers):
+            last, prev, vol = panel.close[d, j], panel.close[d - 1, j], panel.volume[d, j]
+            quotes[t] = (None if math.isnan(last) else float(last), None if math.isnan(prev) else float(prev),
+                         None if math.isnan(vol) else int(vol))
+        ind = None
+        if tech:
+            sl = slice(0, d + 1)
+            ind = compute(Panel(panel.dates[sl], panel.tickers, panel.open[sl], panel.high[sl], panel.low[sl],
+                                panel.close[sl], panel.volume[sl]))
+        df = pick_promising_by_theme_once(rows, stocks, top_n=5, quotes=quotes, indicators=ind)
+        live[d] = [(r["티커"], float(r["AI점수"])) for r in df.to_dict("records")]
+
+    dates = [str(x) for x in panel.dates]
+    history = (dates[first:], themes, counts[first:], pos[first:])
+    data = backtest.prepare(history, panel, stocks)
+    picks, scores = backtest.select(data, None if tech else {"tech_weight": 0.0})  # 기본값 = 운영 규칙
+
+    errors = []
+    for i, day in enumerate(data.days):
+        got = [(data.tickers[c], float(s)) for c, s in zip(picks[i], scores[i]) if c >= 0]
+        want = live[dates.index(day)]
+        if got != want:
+            errors.append(f"{day}: backtest {got} != live {want}")
+    return errors
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="백테스트 규칙 ↔ 실서비스 규칙 픽 일치 검사")
+    ap.add_argument("--tickers", type=int, default=60)
+    ap.add_argument("--days", type=int, default=60, help="비교할 거래일 수")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    failed = 0
+    for tech in (False, True):
+        errors = check(n_tickers=args.tickers, n_days=args.days + 100, days=args.days, seed=args.seed, tech=tech)
+        label = "지표 포함" if tech else "지표 없음"
+        print(f"[parity] {label}: {args.days}거래일 중 불일치 {len(errors)}일", file=sys.stderr)
+        for e in errors[:5]:
+            print(f"  {e}", file=sys.stderr)
+        failed += len(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
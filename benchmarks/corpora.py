@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# benchmarks/corpora.py
+# 시드 고정 합성 데이터 (뉴스 코퍼스 · RSS · OHLC · 시세)
+#
+# 같은 seed → 같은 내용. 시간만 "현재" 기준 상대값이라 _parse_entries 기간 필터를 통과한다.
+
+from __future__ import annotations
+import random
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+from modules.news import KST, THEME_KEYWORDS
+
+# 규모 프리셋: 기사 수 / 티커 수
+SCALES: Dict[str, Dict[str, int]] = {
+    "small":  {"articles": 1_000,     "tickers": 10},
+    "medium": {"articles": 100_000,   "tickers": 500},
+    "large":  {"articles": 1_000_000, "tickers": 5_000},
+}
+
+_KO_WORDS = [
+    "정부", "발표", "시장", "투자자", "증가", "감소", "전망", "분기", "실적", "기업", "수출", "수입",
+    "금리", "인상", "동결", "환율", "상승", "하락", "코스피", "코스닥", "외국인", "기관", "매수", "매도",
+    "정책", "지원", "확대", "규제", "완화", "산업", "경쟁력", "글로벌", "공급망", "신규", "계약", "체결",
+    "협력", "발전", "기술", "개발", "성장", "둔화", "회복", "우려", "기대", "강세", "약세", "관련주",
+]
+_EN_WORDS = [
+    "market", "shares", "rally", "earnings", "guidance", "outlook", "investors", "demand", "supply",
+    "export", "growth", "inflation", "rates", "policy", "record", "deal", "contract", "revenue",
+    "quarter", "surge", "slump", "global", "chip", "battery", "energy", "robot", "nuclear", "biotech",
+]
+_THEME_WORDS = sorted({k for kws in THEME_KEYWORDS.values() for k in kws})
+_SOURCES = ["연합뉴스", "한국경제", "매일경제", "머니투데이", "이데일리", "서울경제", "Reuters", "Bloomberg"]
+
+
+def _sentence(rng: random.Random, n_words: int, en_ratio: float, theme_p: float) -> str:
+    out = []
+    for _ in range(n_words):
+        r = rng.random()
+        if r < theme_p:
+            out.append(rng.choice(_THEME_WORDS))
+        elif r < theme_p + en_ratio * (1 - theme_p):
+            out.append(rng.choice(_EN_WORDS))
+        else:
+            out.append(rng.choice(_KO_WORDS))
+    return " ".join(out)
+
+
+def make_news(n: int, seed: int = 0, days: int = 3, en_ratio: float = 0.2, theme_p: float = 0.08) -> List[Dict[str, str]]:
+    """fetch_* 반환 형식과 같은 기사 dict 목록 (title/link/time/desc), 최신순"""
+    rng = random.Random(seed)
+    now = datetime.now(KST)
+    span = days * 24 * 60
+    offsets = sorted(rng.randrange(span) for _ in range(n))
+    out = []
+    for i, off in enumerate(offsets):
+        t = now - timedelta(minutes=off)
+        title = _sentence(rng, rng.randint(6, 12), en_ratio, theme_p) + f" - {rng.choice(_SOURCES)}"
+        desc = ". ".join(_sentence(rng, rng.randint(8, 15), en_ratio, theme_p) for _ in range(rng.randint(2, 4))) + "."
+        out.append({
+            "title": title,
+            "link": f"https://news.example.com/a/{seed}/{i}",
+            "time": t.strftime("%Y-%m-%d %H:%M"),
+            "desc": desc,
+        })
+    return out
+
+
+def make_feed(n: int, seed: int = 0, days: int = 3) -> SimpleNamespace:
+    """feedparser.parse 결과처럼 .entries 를 가진 객체 (_parse_entries 입력)"""
+    entries = []
+    for it in make_news(n, seed=seed, days=days):
+        t = datetime.strptime(it["time"], "%Y-%m-%d %H:%M").replace(tzinfo=KST)
+        entries.append(SimpleNamespace(
+            title=it["title"], link=it["link"], published=format_datetime(t),
+            summary=f"<a href=\"{it['link']}\">{escape(it['desc'])}</a>",
+        ))
+    return SimpleNamespace(entries=entries)
+
+
+def make_rss_xml(n: int, seed: int = 0, days: int = 3) -> str:
+    """Google News RSS 형식의 XML 문자열 (오프라인 e2e용 _http_get 응답)"""
+    items = []
+    for e in make_feed(n, seed=seed, days=days).entries:
+        items.append(
+            "<item>"
+            f"<title>{escape(e.title)}</title><link>{escape(e.link)}</link>"
+            f"<pubDate>{e.published}</pubDate><description>{escape(e.summary)}</description>"
+            "</item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            "<title>synthetic</title>" + "".join(items) + "</channel></rss>")
+
+
+def make_tickers(n: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """(종목명, 티커) n개"""
+    rng = random.Random(seed)
+    suffix = (".KS", ".KQ")
+    return [(f"종목{i:05d}", f"{100000 + i:06d}{rng.choice(suffix)}") for i in range(n)]
+
+
+def make_theme_stocks(n_tickers: int, seed: int = 0) -> Dict[str, List[Tuple[str, str]]]:
+    """THEME_STOCKS 형식: 전체 티커를 테마에 고르게 배분 (일부는 두 테마에 중복)"""
+    rng = random.Random(seed)
+    themes = list(THEME_KEYWORDS)
+    out: Dict[str, List[Tuple[str, str]]] = {t: [] for t in themes}
+    for i, item in enumerate(make_tickers(n_tickers, seed=seed)):
+        out[themes[i % len(themes)]].append(item)
+        if rng.random() < 0.05:
+            out[rng.choice(themes)].append(item)
+    return out
+
+
+def make_quotes(tickers, seed: int = 0, missing_p: float = 0.03) -> Dict[str, Tuple]:
+    """fetch_quote 형식 {ticker: (last, prev, volume)} - 일부 결측/이상치/저거래량 포함"""
+    rng = random.Random(seed)
+    out = {}
+    for t in tickers:
+        if rng.random() < missing_p:
+            out[t] = (None, None, None)
+            continue
+        prev = rng.uniform(1_000, 300_000)
+        pct = rng.gauss(0, 3) if rng.random() > 0.01 else rng.choice([-45.0, 50.0])
+        vol = int(rng.lognormvariate(12, 1.5))
+        out[t] = (prev * (1 + pct / 100.0), prev, vol)
+    return out
+
+
+def make_ohlc(n_days: int = 120, seed: int = 0, start: float = 50_000.0):
+    """일봉 OHLCV DataFrame (get_ohlc 형식, 영업일 인덱스)"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    ret = rng.normal(0.0003, 0.02, n_days)
+    close = start * np.exp(np.cumsum(ret))
+    open_ = np.concatenate([[start], close[:-1]]) * (1 + rng.normal(0, 0.004, n_days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n_days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n_days)))
+    vol = rng.lognormal(12, 0.8, n_days).astype("int64")
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=n_days)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": vol}, index=idx)
+
+
+def make_ohlc_panel(n_tickers: int, n_days: int = 120, seed: int = 0) -> Dict[str, object]:
+    """{ticker: OHLC DataFrame} - 여러 종목 가격 이력"""
+    return {t: make_ohlc(n_days, seed=seed * 100_003 + i) for i, (_, t) in enumerate(make_tickers(n_tickers, seed=seed))}
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# benchmarks/e2e.py
+# 오프라인 end-to-end 파이프라인 벤치마크
+#
+# 네트워크 경계(_http_get / fetch_quote)만 합성 데이터로 바꾸고 run_pipeline을 그대로 실행한다.
+# RSS 파싱 · 중복 제거 · 테마 감지 · 점수 · CSV/JSON 저장은 실제 코드 경로.
+
+from __future__ import annotations
+import tempfile
+from contextlib import ExitStack
+from typing import Dict, Tuple
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import corpora
+from modules import ai_logic, cache, market, news, pipeline
+
+# run_offline 결과 케이스 이름 (--only 필터가 실행 전에 매칭)
+CASE_NAMES = tuple(f"e2e.{stage}" for stage in pipeline.STAGES) + ("e2e.total",)
+
+
+def _offline_patches(sc: Dict[str, int], seed: int) -> ExitStack:
+    keywords = [kw for kws in news.CATEGORIES.values() for kw in kws]
+    per_kw = max(1, sc["articles"] // len(keywords))
+    xml_by_kw = {kw: corpora.make_rss_xml(per_kw, seed=seed * 1_000 + i) for i, kw in enumerate(keywords)}
+
+    stocks = corpora.make_theme_stocks(sc["tickers"], seed=seed)
+    quotes = corpora.make_quotes([t for v in stocks.values() for _, t in v], seed=seed)
+
+    def fake_http_get(url: str, timeout: int = 8, retries: int = 1) -> str:
+        q = parse_qs(urlparse(url).query).get("q", [""])[0]
+        return xml_by_kw.get(q, "")
+
+    def fake_fetch_quote(ticker: str) -> Tuple:
+        return quotes.get(ticker, (None, None, None))
+
+    ticker_seed = {t: i for i, t in enumerate(quotes)}
+
+    def fake_get_ohlc(ticker: str, days: int = 120):
+        return corpora.make_ohlc(days, seed=seed * 100_003 + ticker_seed.get(ticker, 0))
+
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(cache, "_backend", cache.MemoryBackend()))  # 사용자 캐시와 분리
+    stack.enter_context(mock.patch.object(news, "_http_get", fake_http_get))
+    stack.enter_context(mock.patch.object(news, "THEME_STOCKS", stocks))
+    stack.enter_context(mock.patch.object(market, "fetch_quote", fake_fetch_quote))
+    stack.enter_context(mock.patch.object(ai_logic, "fetch_quote", fake_fetch_quote))
+    stack.enter_context(mock.patch.object(market, "get_ohlc", fake_get_ohlc))
+    return stack
+
+
+def run_offline(sc: Dict[str, int], seed: int = 0, repeat: int = 3, workers: int = 8) -> Dict[str, Dict[str, float]]:
+    """파이프라인을 repeat회 실행 → {"e2e.total": {...}, "e2e.<stage>": {...}} (초, median/min)"""
+    import statistics
+    import bs4, feedparser, pandas  # noqa: F401  실제 파이프라인 의존성 (없으면 ImportError → 건너뜀)
+
+    runs = []
+    with _offline_patches(sc, seed), tempfile.TemporaryDirectory() as out_dir:
+        for _ in range(max(1, repeat)):
+            cache.get_cache().clear()  # 매 회 콜드 캐시
+            res = pipeline.run_pipeline(days=3, per_cat=100, top_n=5, out_dir=out_dir,
+                                        prefix="bench", workers=workers, record_history=False)
+            runs.append(res["timings"])
+
+    n = sc["articles"]
+    out: Dict[str, Dict[str, float]] = {}
+    stages = list(runs[0]) + ["total"]
+    for stage in stages:
+        vals = [sum(r.values()) if stage == "total" else r[stage] for r in runs]
+        out[f"e2e.{stage}"] = {"n": n, "min": min(vals), "median": statistics.median(vals),
+                               "mean": statistics.fmean(vals), "repeat": len(vals)}
+    return out
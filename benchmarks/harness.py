@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# benchmarks/harness.py
+# 측정 · 결과 JSON 저장 · 기준선 비교
+
+from __future__ import annotations
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+DEFAULT_THRESHOLD = 1.25    # 기준선 대비 median 허용 배수
+DEFAULT_MIN_DELTA_S = 0.0005  # 이보다 작은 절대 차이는 노이즈로 간주
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """fn()을 warmup 후 repeat회 실행 → 초 단위 통계 (GC는 측정 구간에서 끔)"""
+    for _ in range(max(0, warmup)):
+        fn()
+    times: List[float] = []
+    gc_was = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+    finally:
+        if gc_was:
+            gc.enable()
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "repeat": len(times),
+    }
+
+
+def meta(**extra) -> Dict[str, Any]:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def save(path: str, results: Dict[str, Dict[str, Any]], info: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"meta": info, "results": results}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD, min_delta_s: float = DEFAULT_MIN_DELTA_S) -> List[str]:
+    """median 기준 회귀 목록 (입력 크기 n이 다르면 비교하지 않음)"""
+    errors = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base or "median" not in cur or "median" not in base:
+            continue
+        if base.get("n") != cur.get("n"):
+            continue
+        if cur["median"] > base["median"] * threshold and cur["median"] - base["median"] > min_delta_s:
+            errors.append(f"{name}: median {cur['median'] * 1000:.2f} ms > "
+                          f"기준 {base['median'] * 1000:.2f} ms × {threshold:g}")
+    return errors
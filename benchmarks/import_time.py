@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# benchmarks/import_time.py
+# 모듈별 콜드스타트 import 비용 측정 (python -X importtime 기반)
+#
+#   python -m benchmarks.import_time              # 측정 + 기준선 비교 (회귀 시 exit 1)
+#   python -m benchmarks.import_time --update     # 기준선 갱신
+#
+# 판정 기준
+#  1) 무거운 의존성(HEAVY)이 모듈 import 시점에 로드되면 실패
+#  2) cumulative import 시간이 기준선 × tolerance + slack 을 넘으면 실패
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "import_time_baseline.json")
+
+MODULES: List[str] = [
+    "modules.market",
+    "modules.news",
+    "modules.ai_logic",
+    "modules.analyzer",
+    "modules.pipeline",
+    "modules.style",
+    "modules.metrics",
+    "modules.cache",
+]
+
+# import 시점에 로드되면 안 되는 패키지 (실제 사용 시점에 지연 로드)
+HEAVY: Tuple[str, ...] = ("matplotlib", "pandas", "yfinance", "bs4", "feedparser", "requests")
+
+DEFAULT_TOLERANCE = 1.5   # 기준선 대비 허용 배수
+DEFAULT_SLACK_US = 5_000  # 측정 노이즈용 절대 여유 (µs)
+
+
+def _run_importtime(module: str) -> Tuple[int, Set[str]]:
+    """새 인터프리터에서 module을 import → (cumulative µs, 로드된 모듈 이름들)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr.strip().splitlines()[-1:]}")
+    cumulative, loaded = None, set()
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        loaded.add(name)
+        if name == module:
+            cumulative = int(parts[1])
+    if cumulative is None:
+        raise RuntimeError(f"{module}: importtime 출력에서 항목을 찾지 못했습니다.")
+    return cumulative, loaded
+
+
+def measure(modules: List[str], repeat: int = 5) -> Dict[str, Dict[str, object]]:
+    """모듈별 최소 cumulative import 시간(µs)과 지연 로드 위반 목록"""
+    out: Dict[str, Dict[str, object]] = {}
+    for mod in modules:
+        best, heavy = None, set()
+        for _ in range(max(1, repeat)):
+            us, loaded = _run_importtime(mod)
+            best = us if best is None else min(best, us)
+            heavy |= {n.split(".")[0] for n in loaded if n.split(".")[0] in HEAVY}
+        out[mod] = {"cumulative_us": best, "heavy_imports": sorted(heavy)}
+    return out
+
+
+def compare(current: Dict[str, Dict[str, object]], baseline: Dict[str, object]) -> List[str]:
+    """회귀 목록 (비어 있으면 통과)"""
+    tol = float(baseline.get("tolerance", DEFAULT_TOLERANCE))
+    slack = int(baseline.get("slack_us", DEFAULT_SLACK_US))
+    base_mods = baseline.get("modules", {}) or {}
+    errors = []
+    for mod, cur in current.items():
+        if cur["heavy_imports"]:
+            errors.append(f"{mod}: import 시점에 무거운 의존성 로드 {cur['heavy_imports']}")
+        base = base_mods.get(mod)
+        if not base:
+            continue
+        limit = int(base["cumulative_us"] * tol + slack)
+        if cur["cumulative_us"] > limit:
+            errors.append(f"{mod}: {cur['cumulative_us']} µs > 허용 {limit} µs (기준 {base['cumulative_us']} µs)")
+    return errors
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="모듈별 import 시간 벤치마크")
+    ap.add_argument("--repeat", type=int, default=5, help="모듈당 측정 횟수 (최솟값 사용)")
+    ap.add_argument("--baseline", default=BASELINE_PATH, help="기준선 JSON 경로")
+    ap.add_argument("--update", action="store_true", help="측정값으로 기준선 갱신")
+    ap.add_argument("--out", help="측정 결과 JSON 저장 경로")
+    ap.add_argument("modules", nargs="*", default=MODULES, help="측정할 모듈 (기본: 전체)")
+    args = ap.parse_args(argv)
+
+    current = measure(args.modules, repeat=args.repeat)
+    for mod, cur in current.items():
+        heavy = f"  ⚠ {','.join(cur['heavy_imports'])}" if cur["heavy_imports"] else ""
+        print(f"{mod:<22} {cur['cumulative_us'] / 1000:8.2f} ms{heavy}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "modules": current}, f, ensure_ascii=False, indent=2)
+
+    if args.update:
+        data = {
+            "python": sys.version.split()[0],
+            "tolerance": DEFAULT_TOLERANCE,
+            "slack_us": DEFAULT_SLACK_US,
+            "modules": {m: {"cumulative_us": c["cumulative_us"]} for m, c in current.items()},
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준선 갱신: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    errors = compare(current, baseline)
+    for e in errors:
+        print(f"[regression] {e}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
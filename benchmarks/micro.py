@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# benchmarks/micro.py
+# 함수 단위 마이크로벤치마크
+#
+# 각 케이스: setup(scale, seed) → (입력 크기 n, 측정할 무인자 함수)
+# 입력 생성은 측정 구간 밖에서 한 번만 한다. 복잡도가 큰 함수는 cap으로 입력을 제한한다.
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks import corpora
+
+Setup = Callable[[Dict[str, int], int], Tuple[int, Callable[[], object]]]
+
+
+@lru_cache(maxsize=4)
+def _news(n: int, seed: int):
+    return corpora.make_news(n, seed=seed)
+
+
+@lru_cache(maxsize=4)
+def _batch(n: int, seed: int):
+    from modules.newsbatch import NewsBatch
+    return NewsBatch.from_records(_news(n, seed))
+
+
+def _cap(sc: Dict[str, int], cap: int) -> int:
+    return min(sc["articles"], cap)
+
+
+def _detect_themes(sc, seed):
+    from modules.news import detect_themes
+    data = _batch(sc["articles"], seed)
+    return len(data), lambda: detect_themes(data)
+
+
+def _index_build(sc, seed):
+    from modules.news_index import NewsIndex
+    data = _batch(sc["articles"], seed)
+    return len(data), lambda: NewsIndex().add(data)
+
+
+_SEARCH_QUERIES = ("반도체 AND 수출", "AI", "이차전지 & 수출", "조선", "수출", "원전 AND 에너지", "로봇 수주")
+
+
+def _index_search(sc, seed):
+    """콜드 조회 1건: 매번 메모를 비우고 질의를 바꿔 가며 (메모 적중만 재는 것 방지)"""
+    import itertools
+    from datetime import datetime, timedelta
+    from modules.news_index import NewsIndex
+    from modules.newsbatch import KST
+    idx = NewsIndex()
+    idx.add(_batch(sc["articles"], seed))
+    since = datetime.now(KST) - timedelta(hours=24)
+    queries = itertools.cycle(_SEARCH_QUERIES)
+
+    def run():
+        idx._memo.clear()
+        return idx.search(next(queries), since=since, k=20)
+    return len(idx), run
+
+
+def _index_add_search(sc, seed):
+    """새 토큰이 든 기사 1건 증분 추가 직후 조회 (대시보드 새로고침 경로)"""
+    import itertools
+    from datetime import datetime, timedelta
+    from modules.news_index import NewsIndex
+    from modules.newsbatch import KST
+    idx = NewsIndex()
+    idx.add(_batch(sc["articles"], seed))
+    since = datetime.now(KST) - timedelta(hours=24)
+    queries, seq = itertools.cycle(_SEARCH_QUERIES), itertools.count()
+
+    def run():
+        i = next(seq)
+        idx.add([{"title": f"신규{i} 반도체 수출", "link": f"bench://{i}", "desc": "", "time": ""}])
+        return idx.search(next(queries), since=since, k=20)
+    return len(idx), run
+
+
+def _batch_from_records(sc, seed):
+    from modules.newsbatch import NewsBatch
+    data = _news(sc["articles"], seed)
+    return len(data), lambda: NewsBatch.from_records(data)
+
+
+def _batch_filter(sc, seed):
+    from datetime import datetime, timedelta
+    from modules.newsbatch import KST
+    batch = _batch(sc["articles"], seed).with_category("경제뉴스")
+    since = datetime.now(KST) - timedelta(hours=24)
+    return len(batch), lambda: batch.filter(since=since, category="경제뉴스")
+
+
+def _batch_pickle(sc, seed):
+    import pickle
+    batch = _batch(sc["articles"], seed)
+    return len(batch), lambda: pickle.loads(pickle.dumps(batch, protocol=5))
+
+
+def _extract_keywords(sc, seed):
+    from modules.ai_logic import extract_keywords
+    titles = [n["title"] for n in _news(sc["articles"], seed)]
+    return len(titles), lambda: extract_keywords(titles, topn=20)
+
+
+def _summarize_sentences(sc, seed):
+    from modules.ai_logic import summarize_sentences
+    # 문장 수 × 전체 텍스트 길이에 비례 → 입력 제한
+    texts = [n["desc"] for n in _news(sc["articles"], seed)[:_cap(sc, 2_000)]]
+    return len(texts), lambda: summarize_sentences(texts, n_sent=5)
+
+
+def _parse_entries(sc, seed):
+    from modules.news import _parse_entries as parse
+    feed = corpora.make_feed(_cap(sc, 100_000), seed=seed)
+    return len(feed.entries), lambda: parse(feed, days=3)
+
+
+def _plot_candles(sc, seed):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from modules.chart import plot_candles
+    df = corpora.make_ohlc(250, seed=seed)
+
+    def run():
+        plt.close(plot_candles(df, title="bench", lookback=120))
+    return len(df), run
+
+
+def _indicators_compute(sc, seed):
+    from modules.indicators import build_panel, compute
+    # 상관행렬이 종목 수²에 비례 → 종목 수 제한
+    panel = build_panel(corpora.make_ohlc_panel(min(sc["tickers"], 500), n_days=250, seed=seed))
+    return len(panel.tickers), lambda: compute(panel)
+
+
+def _backtest_run(sc, seed):
+    import numpy as np
+    from modules import backtest
+    from modules.indicators import build_panel
+    # 2년치 일봉 × 테마 종목 (종목 수 제한)
+    stocks = corpora.make_theme_stocks(min(sc["tickers"], 500), seed=seed)
+    tickers = list(dict.fromkeys(t for v in stocks.values() for _, t in v))
+    panel = build_panel({t: corpora.make_ohlc(500, seed=seed * 100_003 + i) for i, t in enumerate(tickers)})
+    themes = sorted(stocks)
+    counts = np.random.default_rng(seed).integers(0, 30, size=(len(panel), len(themes))).astype(float)
+    data = backtest.prepare(([str(d) for d in panel.dates], themes, counts), panel, stocks)
+    return len(data), lambda: backtest.run(data)
+
+
+def _scoring_inputs(sc, seed):
+    from modules.news import detect_themes
+    stocks = corpora.make_theme_stocks(sc["tickers"], seed=seed)
+    theme_rows = detect_themes(_batch(_cap(sc, 1_000), seed))
+    quotes = corpora.make_quotes([t for v in stocks.values() for _, t in v], seed=seed)
+    return theme_rows, stocks, quotes
+
+
+def _pick_promising(sc, seed):
+    from modules.ai_logic import pick_promising_by_theme_once
+    theme_rows, stocks, quotes = _scoring_inputs(sc, seed)
+    return len(quotes), lambda: pick_promising_by_theme_once(theme_rows, stocks, top_n=5, quotes=quotes)
+
+
+def _make_theme_report(sc, seed):
+    from modules.ai_logic import make_theme_report
+    theme_rows, stocks, quotes = _scoring_inputs(sc, seed)
+    return len(quotes), lambda: make_theme_report(theme_rows, stocks, quotes=quotes)
+
+
+CASES: List[Tuple[str, Setup]] = [
+    ("news.detect_themes", _detect_themes),
+    ("news._parse_entries", _parse_entries),
+    ("news_index.add", _index_build),
+    ("news_index.search", _index_search),
+    ("news_index.add_search", _index_add_search),
+    ("newsbatch.from_records", _batch_from_records),
+    ("newsbatch.filter", _batch_filter),
+    ("newsbatch.pickle_roundtrip", _batch_pickle),
+    ("ai_logic.extract_keywords", _extract_keywords),
+    ("ai_logic.summarize_sentences", _summarize_sentences),
+    ("ai_logic.pick_promising_by_theme_once", _pick_promising),
+    ("ai_logic.make_theme_report", _make_theme_report),
+    ("indicators.compute", _indicators_compute),
+    ("backtest.run", _backtest_run),
+    ("chart.plot_candles", _plot_candles),
+]
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# benchmarks/run.py
+# 벤치마크 실행기 (마이크로 + 오프라인 e2e)
+#
+#   python -m benchmarks.run --scale small                       # 측정 → benchmarks/results/small.json
+#   python -m benchmarks.run --scale small --baseline base.json  # 기준선 대비 회귀 시 exit 1
+#   python -m benchmarks.run --scale medium --only detect --no-e2e
+#
+# 규모: small(1k 기사/10 티커) · medium(100k/500) · large(1M/5,000)
+
+from __future__ import annotations
+import argparse
+import os
+import sys
+from typing import Any, Dict
+
+from benchmarks import corpora, harness
+from benchmarks.micro import CASES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def run(scale: str, seed: int = 0, repeat: int = 5, only: str = "", e2e: bool = True) -> Dict[str, Dict[str, Any]]:
+    sc = corpora.SCALES[scale]
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, setup in CASES:
+        if only and only not in name:
+            continue
+        try:
+            n, fn = setup(sc, seed)
+            stats = harness.measure(fn, repeat=repeat)
+        except ImportError as e:  # 선택 의존성(matplotlib 등) 미설치 → 건너뜀으로 기록
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{name:<40} skipped ({e})", file=sys.stderr)
+            continue
+        results[name] = {"n": n, **stats}
+        print(f"{name:<40} n={n:<9} median {stats['median'] * 1000:10.2f} ms", file=sys.stderr)
+
+    if e2e:
+        try:
+            from benchmarks.e2e import CASE_NAMES, run_offline
+            if only and not any(only in name for name in CASE_NAMES):
+                return results
+            for name, stats in run_offline(sc, seed=seed, repeat=max(1, repeat // 2)).items():
+                if only and only not in name:
+                    continue
+                results[name] = stats
+                print(f"{name:<40} n={stats['n']:<9} median {stats['median'] * 1000:10.2f} ms", file=sys.stderr)
+        except ImportError as e:
+            results["e2e"] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{'e2e':<40} skipped ({e})", file=sys.stderr)
+    return results
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="AI 뉴스리포트 벤치마크")
+    ap.add_argument("--scale", choices=list(corpora.SCALES), default="small")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", default="", help="이름에 이 문자열이 포함된 케이스만 실행 (e2e 포함)")
+    ap.add_argument("--no-e2e", action="store_true", help="e2e 파이프라인 벤치마크 생략")
+    ap.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/<scale>.json)")
+    ap.add_argument("--baseline", help="비교할 기준선 결과 JSON")
+    ap.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD, help="median 허용 배수")
+    args = ap.parse_args(argv)
+
+    results = run(args.scale, seed=args.seed, repeat=args.repeat, only=args.only, e2e=not args.no_e2e)
+    out = args.out or os.path.join(RESULTS_DIR, f"{args.scale}.json")
+    harness.save(out, results, harness.meta(scale=args.scale, seed=args.seed, **corpora.SCALES[args.scale]))
+    print(f"결과 저장: {out}", file=sys.stderr)
+
+    if args.baseline:
+        errors = harness.compare(results, harness.load(args.baseline).get("results", {}), threshold=args.threshold)
+        for e in errors:
+            print(f"[regression] {e}", file=sys.stderr)
+        return 1 if errors else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# cli.py - AI 뉴스리포트 헤드리스 실행 (cron/배치용)
+#
+#   python cli.py report --days 3 --top-n 5 --format both --workers 8
+#   python cli.py serve --port 8765        # 공유 스냅샷 API (modules/snapshot_api.py)
+#   python cli.py backtest --max-abs-move 15 25 35 --min-volume 0 30000 --workers 8
+#
+# 종료 코드: 0=성공, 1=실패(빈 데이터/예외), 2=인자 오류
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+
+FORMAT_CHOICES = {"csv": ("csv",), "json": ("json",), "both": ("csv", "json")}
+
+
+def _cmd_report(args: argparse.Namespace) -> int:
+    from modules import metrics
+    from modules.pipeline import PipelineError, run_pipeline
+
+    if args.metrics_out:
+        metrics.enable(True)
+    res = None
+    try:
+        res = run_pipeline(
+            days=args.days, per_cat=args.per_cat, top_n=args.top_n,
+            out_dir=args.out_dir, prefix=args.prefix,
+            formats=FORMAT_CHOICES[args.format], workers=args.workers,
+            record_history=not args.no_history,
+        )
+    except PipelineError as e:
+        print(f"[report] 실패: {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"[report] 오류: {type(e).__name__}: {e}", file=sys.stderr)
+    if args.metrics_out:  # 실패한 실행의 메트릭도 남긴다
+        try:
+            metrics.write_textfile(args.metrics_out)
+        except OSError as e:
+            print(f"[report] 메트릭 저장 실패: {e}", file=sys.stderr)
+            return 1
+    if res is None:
+        return 1
+
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return 0
+    for stage, sec in res["timings"].items():
+        print(f"[time] {stage:<7} {sec * 1000:9.1f} ms", file=sys.stderr)
+    total = sum(res["timings"].values())
+    print(f"[time] {'total':<7} {total * 1000:9.1f} ms", file=sys.stderr)
+    for host, n in sorted(res["upstream_calls"].items()):
+        print(f"[calls] {host}: {n}", file=sys.stderr)
+    print(f"[report] 뉴스 {res['news']}건 · 테마 {res['themes']}개 · 유망종목 {res['picks']}개", file=sys.stderr)
+    for p in res["paths"].values():
+        print(p)
+    return 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from modules import snapshot_api
+
+    store = snapshot_api.SnapshotStore(
+        snapshot_api.default_producers(days=args.days, per_cat=args.per_cat, workers=args.workers),
+        snapshot_api.TTLS,
+    )
+    print(f"[serve] http://{args.host}:{args.port}/v1/keys", file=sys.stderr)
+    try:
+        snapshot_api.serve(args.host, args.port, refresh=args.refresh, store=store)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"[serve] 기동 실패: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+GRID_ARGS = ("max_abs_move", "outlier_drop", "min_volume", "freq_cap", "freq_weight", "move_weight",
+             "tech_weight", "top_n")
+
+
+def _cmd_backtest(args: argparse.Namespace) -> int:
+    from datetime import date, timedelta
+    from modules import backtest as bt
+    from modules.news import THEME_STOCKS
+
+    axes = {k: getattr(args, k) for k in GRID_ARGS if getattr(args, k)}
+    sort_key = args.sort or f"sharpe_{args.horizons[0]}d"
+    try:
+        grid = bt.param_grid(**axes)
+        history = bt.load_theme_history(args.db, start=args.start, end=args.end)
+        if not history[0]:
+            print(f"[backtest] 저장된 테마 이력이 없습니다: {args.db} (cli.py report 실행 시 기록)", file=sys.stderr)
+            return 1
+        tickers = sorted({t for th in history[1] for _, t in THEME_STOCKS.get(th, [])})
+        start = (date.fromisoformat(history[0][0]) - timedelta(days=bt.WARMUP_DAYS)).isoformat()  # 지표 워밍업
+        panel = bt.load_price_history(tuple(tickers), start=start)
+        data = bt.prepare(history, panel, THEME_STOCKS, horizons=args.horizons)
+        if not len(data):
+            print("[backtest] 테마 이력과 겹치는 거래일 가격이 없습니다.", file=sys.stderr)
+            return 1
+        res = bt.run_grid(data, grid, workers=args.workers)
+    except ValueError as e:
+        print(f"[backtest] 인자 오류: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"[backtest] 오류: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    if sort_key not in res.columns:
+        print(f"[backtest] 정렬 기준 없음: {sort_key} ({', '.join(res.columns)})", file=sys.stderr)
+        return 2
+
+    res = res.sort_values(sort_key, ascending=False, na_position="last")
+    if args.out:
+        res.to_csv(args.out, index=False)
+    print(f"[backtest] {data.days[0]}~{data.days[-1]} {len(data)}거래일 · 조합 {len(grid)}개", file=sys.stderr)
+    if args.json:
+        print(res.head(args.limit).to_json(orient="records", force_ascii=False, indent=2))
+    else:
+        print(res.head(args.limit).to_string(index=False))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="cli.py", description="AI 뉴스리포트 헤드리스 실행")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    rp = sub.add_parser("report", help="뉴스→테마→유망종목→저장 파이프라인 실행")
+    rp.add_argument("--days", type=int, default=3, help="최근 N일 뉴스 (기본 3)")
+    rp.add_argument("--per-cat", type=int, default=100, help="카테고리당 최대 기사 수 (기본 100)")
+    rp.add_argument("--top-n", type=int, default=5, help="유망종목 개수 (기본 5)")
+    rp.add_argument("--format", choices=sorted(FORMAT_CHOICES), default="both", help="저장 형식 (기본 both)")
+    rp.add_argument("--workers", type=int, default=8, help="업스트림 동시 요청 수 (기본 8, 1=순차)")
+    rp.add_argument("--out-dir", default="reports", help="저장 폴더 (기본 reports)")
+    rp.add_argument("--prefix", default="batch", help="파일명 접두어 (기본 batch)")
+    rp.add_argument("--metrics-out", help="Prometheus 텍스트 메트릭 저장 경로 (textfile collector용)")
+    rp.add_argument("--json", action="store_true", help="결과 요약을 JSON으로 stdout 출력")
+    rp.add_argument("--no-history", action="store_true", help="백테스트용 일별 테마 건수 저장 안 함")
+    rp.set_defaults(func=_cmd_report)
+
+    sp = sub.add_parser("serve", help="공유 스냅샷 JSON API 서버 실행")
+    sp.add_argument("--host", default="127.0.0.1")
+    sp.add_argument("--port", type=int, default=8765)
+    sp.add_argument("--refresh", type=float, default=30.0, help="백그라운드 갱신 주기 초 (0=요청 시에만)")
+    sp.add_argument("--days", type=int, default=3)
+    sp.add_argument("--per-cat", type=int, default=100)
+    sp.add_argument("--workers", type=int, default=8)
+    sp.set_defaults(func=_cmd_serve)
+
+    bp = sub.add_parser("backtest", help="저장된 일별 테마 건수로 유망종목 점수 규칙 백테스트")
+    bp.add_argument("--db", default="data/analysis.db", help="테마 이력 DB (기본 data/analysis.db)")
+    bp.add_argument("--start", help="시작일 YYYY-MM-DD (기본: 이력 전체)")
+    bp.add_argument("--end", help="종료일 YYYY-MM-DD")
+    bp.add_argument("--horizons", type=int, nargs="+", default=[1, 5], help="보유 거래일 (기본 1 5)")
+    for name in GRID_ARGS:  # 값 여러 개 → 그리드 (생략 시 현재 규칙 값)
+        bp.add_argument(f"--{name.replace('_', '-')}", type=int if name == "top_n" else float, nargs="+")
+    bp.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본 CPU 수, 1=순차)")
+    bp.add_argument("--sort", help="정렬 기준 컬럼 (기본 sharpe_<첫 보유기간>d)")
+    bp.add_argument("--limit", type=int, default=20, help="출력 행 수 (기본 20)")
+    bp.add_argument("--out", help="전체 결과 CSV 저장 경로")
+    bp.add_argument("--json", action="store_true", help="결과를 JSON으로 stdout 출력")
+    bp.set_defaults(func=_cmd_backtest)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 import os, json, re
-import numpy as np
-import pandas as pd
+from datetime import datetime
 from collections import Counter
 from modules.market import fetch_quote
+# pandas는 DataFrame을 만들 때만 로드 (콜드스타트 단축)
 
 # ---------- 요약/키워드 ----------
 def extract_keywords(titles, topn=10):
@@ -24,6 +24,11 @@ def summarize_sentences(texts, n_sent=5):
     ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     return [s for s, _ in ranked[:n_sent]]
 
+# ---------- 시세 조회 (미리 받아둔 quotes가 있으면 재사용) ----------
+def _get_quote(ticker, quotes=None):
+    q = quotes.get(ticker) if quotes is not None else None
+    return q if q is not None else fetch_quote(ticker)
+
 # ---------- 테마 강도/리스크 ----------
 def calc_theme_strength(count, avg_delta):
     freq = min(count / 20.0, 1.0)
@@ -37,17 +42,18 @@ def calc_risk_level(avg_delta):
     if avg_delta >= -3: return 4
     return 5
 
-def make_theme_report(theme_rows, theme_stocks_map):
+def make_theme_report(theme_rows, theme_stocks_map, quotes=None):
+    import pandas as pd
     rows = []
     for tr in theme_rows[:8]:
         theme = tr["theme"]
         stocks = theme_stocks_map.get(theme, [])
         deltas = []
         for _, t in stocks:
-            last, prev, _ = fetch_quote(t)
+            last, prev, _ = _get_quote(t, quotes)
             if last and prev:
                 deltas.append((last - prev) / prev * 100.0)
-        avg_delta = float(np.mean(deltas)) if deltas else 0.0
+        avg_delta = sum(deltas) / len(deltas) if deltas else 0.0
         rows.append({
             "테마": theme,
             "뉴스건수": tr["count"],
@@ -61,9 +67,13 @@ def make_theme_report(theme_rows, theme_stocks_map):
 MAX_ABS_MOVE = 25.0     # 점수 캡
 OUTLIER_DROP = 35.0     # 이상치 제외
 MIN_VOLUME   = 30_000   # 거래량 하한 (없으면 통과)
+FREQ_CAP     = 20.0     # 뉴스빈도 만점 기준 (건)
+FREQ_WEIGHT  = 0.4      # 뉴스빈도 비중
+MOVE_WEIGHT  = 0.6      # 등락률 비중
+TECH_WEIGHT  = 0.3      # 지표(indicators)가 있을 때 기술점수 비중
 
-def _safe_delta_pct(ticker: str):
-    last, prev, vol = fetch_quote(ticker)
+def _safe_delta_pct(ticker: str, quotes=None):
+    last, prev, vol = _get_quote(ticker, quotes)
     if not last or not prev:
         return None
     pct = (last - prev) / prev * 100.0
@@ -71,28 +81,38 @@ def _safe_delta_pct(ticker: str):
         return None
     if abs(pct) > OUTLIER_DROP:
         return None
-    pct_for_score = float(np.clip(pct, -MAX_ABS_MOVE, MAX_ABS_MOVE))
+    pct_for_score = float(max(-MAX_ABS_MOVE, min(MAX_ABS_MOVE, pct)))
     return pct, pct_for_score, vol
 
-def pick_promising_by_theme_once(theme_rows, theme_stocks_map, top_n=5):
+def pick_promising_by_theme_once(theme_rows, theme_stocks_map, top_n=5, quotes=None, indicators=None):
+    """indicators(modules.indicators.Indicators)가 있으면 기술점수(-1~1)를 TECH_WEIGHT만큼 섞는다."""
+    import pandas as pd
     selected = []
     for tr in theme_rows:
         theme = tr["theme"]; freq = tr["count"]
         best = None
         for name, ticker in theme_stocks_map.get(theme, []):
-            res = _safe_delta_pct(ticker)
+            res = _safe_delta_pct(ticker, quotes)
             if res is None:
                 continue
             real_pct, score_pct, vol = res
-            freq_score = min(freq / 20.0, 1.0)
-            score = freq_score * 0.4 + (score_pct / MAX_ABS_MOVE) * 0.6  # -1~1
+            freq_score = min(freq / FREQ_CAP, 1.0)
+            score = freq_score * FREQ_WEIGHT + (score_pct / MAX_ABS_MOVE) * MOVE_WEIGHT  # -1~1
             cand = {
                 "테마": theme, "종목명": name, "티커": ticker,
                 "등락률(%)": round(real_pct, 2),
                 "뉴스빈도": freq,
-                "AI점수": round(score * 100, 2),
+                "AI점수": None,
                 "거래량": vol
             }
+            if indicators is not None:
+                tech = indicators.value(ticker, "tech_score")
+                if tech is not None:
+                    score = score * (1 - TECH_WEIGHT) + tech * TECH_WEIGHT
+                rsi14, vol_z = indicators.value(ticker, "rsi14"), indicators.value(ticker, "volume_z20")
+                cand["RSI(14)"] = round(rsi14, 1) if rsi14 is not None else None
+                cand["거래량Z"] = round(vol_z, 2) if vol_z is not None else None
+            cand["AI점수"] = round(score * 100, 2)
             if best is None or cand["AI점수"] > best["AI점수"]:
                 best = cand
         if best:
@@ -103,24 +123,29 @@ def pick_promising_by_theme_once(theme_rows, theme_stocks_map, top_n=5):
     return pd.DataFrame(selected)
 
 # ---------- 저장 유틸 ----------
-def save_report_and_picks(theme_rows, theme_stocks_map, out_dir="reports", top_n=5, prefix="export"):
-    os.makedirs(out_dir, exist_ok=True)
-    # 테마 리포트
-    theme_df = make_theme_report(theme_rows, theme_stocks_map)
-    # 유망 종목
-    picks_df = pick_promising_by_theme_once(theme_rows, theme_stocks_map, top_n=top_n)
+EXPORT_FORMATS = ("csv", "json")
 
+def export_report_and_picks(theme_df, picks_df, out_dir="reports", prefix="export", formats=EXPORT_FORMATS):
+    bad = [f for f in formats if f not in EXPORT_FORMATS]
+    if bad or not formats:
+        raise ValueError(f"지원하지 않는 저장 형식: {bad or formats}")
+    os.makedirs(out_dir, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    paths = {
-        "report_csv":  os.path.join(out_dir, f"{prefix}_theme_report_{ts}.csv"),
-        "report_json": os.path.join(out_dir, f"{prefix}_theme_report_{ts}.json"),
-        "picks_csv":   os.path.join(out_dir, f"{prefix}_promising_picks_{ts}.csv"),
-        "picks_json":  os.path.join(out_dir, f"{prefix}_promising_picks_{ts}.json"),
-    }
-    theme_df.to_csv(paths["report_csv"], index=False)
-    theme_df.to_json(paths["report_json"], force_ascii=False, orient="records", indent=2)
-    picks_df.to_csv(paths["picks_csv"], index=False)
-    picks_df.to_json(paths["picks_json"], force_ascii=False, orient="records", indent=2)
+    paths = {}
+    for key, df, stem in (("report", theme_df, "theme_report"), ("picks", picks_df, "promising_picks")):
+        if "csv" in formats:
+            paths[f"{key}_csv"] = os.path.join(out_dir, f"{prefix}_{stem}_{ts}.csv")
+            df.to_csv(paths[f"{key}_csv"], index=False)
+        if "json" in formats:
+            paths[f"{key}_json"] = os.path.join(out_dir, f"{prefix}_{stem}_{ts}.json")
+            df.to_json(paths[f"{key}_json"], force_ascii=False, orient="records", indent=2)
     return paths
 
-from datetime import datetime  # save_report_and_picks에서 사용
+def save_report_and_picks(theme_rows, theme_stocks_map, out_dir="reports", top_n=5, prefix="export",
+                          formats=EXPORT_FORMATS, quotes=None, indicators=None):
+    # 테마 리포트
+    theme_df = make_theme_report(theme_rows, theme_stocks_map, quotes=quotes)
+    # 유망 종목 (화면/배치와 같은 지표를 넘겨야 AI점수가 일치)
+    picks_df = pick_promising_by_theme_once(theme_rows, theme_stocks_map, top_n=top_n, quotes=quotes,
+                                            indicators=indicators)
+    return export_report_and_picks(theme_df, picks_df, out_dir=out_dir, prefix=prefix, formats=formats)
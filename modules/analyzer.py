@@ -2,15 +2,13 @@
 from __future__ import annotations
 import os, json, sqlite3
 from datetime import datetime, timezone, timedelta
-from typing import Tuple, Dict, Any
-import pandas as pd
+from typing import TYPE_CHECKING, Tuple, Dict, Any
 
-try:
-    import yfinance as yf  # type: ignore
-    _YF = True
-except Exception:
-    yf = None  # type: ignore
-    _YF = False
+from modules.market import load_yfinance
+from modules import singleflight
+
+if TYPE_CHECKING:  # pandas는 load_recent에서만 로드
+    import pandas as pd
 
 KST = timezone(timedelta(hours=9))
 DB_DIR = "data"
@@ -31,8 +29,10 @@ def init_db() -> None:
         """)
         conn.commit()
 
+@singleflight.single_flight("analyzer", timeout=singleflight.DEFAULT_TIMEOUT)  # 여러 세션이 같은 종목을 동시에 분석해도 yfinance 조회는 1건
 def _fetch_basic(ticker: str) -> Dict[str, Any]:
-    if not _YF:
+    yf = load_yfinance()
+    if yf is None:
         return {}
     try:
         t = yf.Ticker(ticker)
@@ -49,8 +49,12 @@ def _fetch_basic(ticker: str) -> Dict[str, Any]:
     except Exception:
         return {}
 
-def analyze_stock(name: str, ticker: str) -> Tuple[str, Dict[str, Any]]:
-    payload = _fetch_basic(ticker)
+def analyze_stock(name: str, ticker: str, indicators=None) -> Tuple[str, Dict[str, Any]]:
+    """indicators(테마 유니버스 지표)를 넘기면 재계산 없이 해당 종목 값을 쓴다."""
+    try:
+        payload = _fetch_basic(ticker)
+    except singleflight.FlightTimeout:
+        payload = {}  # 같은 종목 조회가 오래 걸리면 기다리지 않고 빈 결과로 진행 (조회 실패와 동일)
     last, prev = payload.get("last"), payload.get("prev")
     change_pct = None
     if isinstance(last, (int, float)) and isinstance(prev, (int, float)) and prev:
@@ -60,10 +64,25 @@ def analyze_stock(name: str, ticker: str) -> Tuple[str, Dict[str, Any]]:
     trend7 = (series[-1] - series[-7]) / series[-7] * 100.0 if len(series) >= 7 else None
     trend30 = (series[-1] - series[0]) / series[0] * 100.0 if len(series) >= 30 else None
 
+    ind = indicators
+    if ind is None or ticker not in ind:
+        from modules.indicators import safe_indicators  # numpy 지표 엔진은 분석 시점에 로드 (콜드스타트 단축)
+        ind = safe_indicators([ticker])
+        if ind is not None and ticker not in ind:
+            ind = None
+    tech = {k: ind.value(ticker, k) for k in ("ma20", "rsi14", "atr_pct14", "vol20", "volume_z20", "tech_score")} \
+        if ind is not None else {}
+    last_close = ind.value(ticker, "close") if ind is not None else None
+    ma_gap = (last_close / tech["ma20"] - 1) * 100.0 if last_close and tech.get("ma20") else None
+
     parts = []
     if change_pct is not None: parts.append(f"전일대비 {change_pct:+.2f}%")
     if trend7 is not None: parts.append(f"7일 {trend7:+.2f}%")
     if trend30 is not None: parts.append(f"30일 {trend30:+.2f}%")
+    if ma_gap is not None: parts.append(f"20일선 {ma_gap:+.1f}%")
+    if tech.get("rsi14") is not None: parts.append(f"RSI {tech['rsi14']:.0f}")
+    if tech.get("vol20") is not None: parts.append(f"변동성 {tech['vol20']:.0f}%")
+    if tech.get("volume_z20") is not None: parts.append(f"거래량Z {tech['volume_z20']:+.1f}")
     if not parts: parts.append("데이터 제한으로 간단 요약만 제공합니다.")
     summary = f"{name}({ticker}) · " + ", ".join(parts)
 
@@ -71,6 +90,7 @@ def analyze_stock(name: str, ticker: str) -> Tuple[str, Dict[str, Any]]:
         "name": name, "ticker": ticker,
         "last": last, "prev": prev,
         "change_pct": change_pct, "trend7": trend7, "trend30": trend30,
+        "ma20_gap": ma_gap, **tech,
     }
     ts = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
     with sqlite3.connect(DB_PATH) as conn:
@@ -82,6 +102,7 @@ def analyze_stock(name: str, ticker: str) -> Tuple[str, Dict[str, Any]]:
     return summary, rec
 
 def load_recent(limit: int = 10) -> pd.DataFrame:
+    import pandas as pd
     if not os.path.exists(DB_PATH):
         return pd.DataFrame(columns=["시간", "종목명", "티커", "요약"])
     with sqlite3.connect(DB_PATH) as conn:
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+# modules/backtest.py
+# 유망종목 점수 규칙 백테스트: 저장된 일별 테마 건수 + 가격 이력을 재생
+#
+#   data = prepare(load_theme_history(), load_price_history(tickers, start="2023-01-01"), THEME_STOCKS)
+#   run(data)                                    # 현재 운영 규칙(ai_logic 상수, 지표 반영 TECH_WEIGHT) 성과
+#   run_grid(data, param_grid(max_abs_move=[15, 25, 35], min_volume=[0, 30_000]), workers=8)
+#
+# - 한 파라미터 조합은 전체 거래일을 (일 × 테마 × 종목) 배열 연산 한 번으로 계산 (일자 루프 없음)
+# - 조합들은 프로세스 풀로 병렬 실행, 준비된 배열은 워커 기동 시 한 번만 전달
+# - 픽 시점: 테마 집계일 종가 (당일 등락률로 점수) → 보유 h거래일 후 종가로 수익률
+
+from __future__ import annotations
+import itertools
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.ai_logic import (
+    FREQ_CAP, FREQ_WEIGHT, MAX_ABS_MOVE, MIN_VOLUME, MOVE_WEIGHT, OUTLIER_DROP, TECH_WEIGHT,
+)
+from modules.analyzer import DB_PATH
+from modules.cache import NEGATIVE_TTL, NoStore, cached
+from modules.indicators import Panel, build_panel, compute
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+KST = timezone(timedelta(hours=9))
+HORIZONS = (1, 5)
+# 첫 집계일 이전에 받아 둘 가격 이력 (달력일, 약 80거래일) - 첫날부터 tech_score(20일선 · RSI14 · 거래량Z20)가 채워지도록
+WARMUP_DAYS = 120
+
+DEFAULT_PARAMS: Dict[str, float] = {
+    "max_abs_move": MAX_ABS_MOVE,
+    "outlier_drop": OUTLIER_DROP,
+    "min_volume": MIN_VOLUME,
+    "freq_cap": FREQ_CAP,
+    "freq_weight": FREQ_WEIGHT,
+    "move_weight": MOVE_WEIGHT,
+    "tech_weight": TECH_WEIGHT,  # 운영 호출(대시보드/배치/스냅샷 API)은 모두 지표를 넘김 · 0 = 지표 없는 규칙
+    "top_n": 5,
+}
+
+
+# ---------- 일별 테마 건수 저장/조회 ----------
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS theme_daily (
+      day TEXT NOT NULL,
+      theme TEXT NOT NULL,
+      count INTEGER NOT NULL,
+      pos INTEGER,
+      PRIMARY KEY (day, theme)
+    )
+    """)
+    # pos: 그날 theme_rows 안의 순서 (건수 동률 테마의 감지 순서) - pos 이전 DB는 컬럼 추가, 기존 행은 NULL
+    if "pos" not in {r[1] for r in conn.execute("PRAGMA table_info(theme_daily)")}:
+        conn.execute("ALTER TABLE theme_daily ADD COLUMN pos INTEGER")
+    return conn
+
+
+def record_theme_counts(theme_rows: Sequence[Mapping[str, Any]], day: Optional[str] = None,
+                        db_path: str = DB_PATH) -> int:
+    """detect_themes 결과를 해당 일자(KST) 건수 · 순서로 저장 (같은 날 다시 실행하면 덮어씀)"""
+    day = day or datetime.now(KST).date().isoformat()
+    rows = [(day, r["theme"], int(r["count"]), i) for i, r in enumerate(theme_rows)]
+    with _connect(db_path) as conn:
+        conn.execute("DELETE FROM theme_daily WHERE day=?", (day,))
+        conn.executemany("INSERT INTO theme_daily(day, theme, count, pos) VALUES (?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def load_theme_history(db_path: str = DB_PATH, start: Optional[str] = None,
+                       end: Optional[str] = None) -> Tuple[List[str], List[str], np.ndarray, np.ndarray]:
+    """
+    → (일자 목록, 테마 목록, 건수 행렬 (일 × 테마) 없는 테마는 0, 순서 행렬 (일 × 테마) 없으면 inf)
+    순서는 그날 theme_rows 안의 위치 → 건수 동률 테마를 원 규칙과 같은 순서로 훑는다.
+    """
+    q, args = "SELECT day, theme, count, pos FROM theme_daily WHERE 1=1", []
+    if start:
+        q += " AND day >= ?"; args.append(start)
+    if end:
+        q += " AND day <= ?"; args.append(end)
+    with _connect(db_path) as conn:
+        rows = conn.execute(q + " ORDER BY day", args).fetchall()
+    days = sorted({r[0] for r in rows})
+    themes = sorted({r[1] for r in rows})
+    counts = np.zeros((len(days), len(themes)))
+    pos = np.full((len(days), len(themes)), np.inf)  # pos 이전 기록(NULL)은 동률이면 테마 이름순
+    di, ti = {d: i for i, d in enumerate(days)}, {t: i for i, t in enumerate(themes)}
+    for d, t, c, p in rows:
+        counts[di[d], ti[t]] = c
+        if p is not None:
+            pos[di[d], ti[t]] = p
+    return days, themes, counts, pos
+
+
+# ---------- 가격 이력 ----------
+@cached("ohlc")
+def load_price_history(tickers: Tuple[str, ...], start: str, end: Optional[str] = None) -> Panel:
+    """여러 종목 일봉을 한 번의 yfinance 요청으로 → Panel (수정주가)"""
+    from modules.market import load_yfinance, yf_download
+    if load_yfinance() is None:
+        raise RuntimeError("yfinance를 사용할 수 없습니다.")
+    tickers = tuple(tickers)
+    df = yf_download(list(tickers), start=start, end=end, interval="1d", auto_adjust=True,
+                     progress=False, group_by="ticker")
+    if df is None or df.empty:
+        return NoStore(build_panel({}), ttl=NEGATIVE_TTL)  # type: ignore[return-value]  빈 응답은 짧게만 캐시
+    if len(tickers) == 1 and df.columns.nlevels == 1:
+        frames = {tickers[0]: df}
+    else:
+        top = set(df.columns.get_level_values(0))
+        frames = {t: df[t] for t in tickers if t in top}
+    return build_panel({t: f.dropna(subset=["Close"]) for t, f in frames.items()})
+
+
+# ---------- 준비된 배열 ----------
+class BacktestData:
+    """
+    days: 테마 집계일 중 가격 이력에 있는 거래일 (D), themes (K), tickers (N)
+    counts (D, K) · order (D, K) 테마를 훑는 순서 (건수 내림차순, 동률은 기록된 순서)
+    members (K, S) 종목 열 번호 (-1=패딩) · pct/volume/tech (D, N) · fwd {h: (D, N)}
+    """
+
+    def __init__(self, days, themes, tickers, counts, order, members, pct, volume, tech, fwd, universe):
+        self.days, self.themes, self.tickers = list(days), list(themes), list(tickers)
+        self.counts, self.order, self.members = counts, order, members
+        self.pct, self.volume, self.tech, self.fwd, self.universe = pct, volume, tech, fwd, universe
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+def prepare(history: Tuple[Any, ...], panel: Panel,
+            theme_stocks: Mapping[str, Sequence[Tuple[str, str]]], horizons: Sequence[int] = HORIZONS) -> BacktestData:
+    """history: load_theme_history 결과 (순서 행렬 없이 (days, themes, counts)만 주면 동률은 테마 목록 순)"""
+    days, themes, counts = history[:3]
+    pos = history[3] if len(history) > 3 else np.zeros_like(counts)
+    col = {t: i for i, t in enumerate(panel.tickers)}
+    pdays = {str(d): i for i, d in enumerate(panel.dates)}
+    keep = [i for i, d in enumerate(days) if d in pdays]  # 휴장일 집계는 제외 (다음 날 가격으로 픽하면 미래 정보)
+    rows = np.asarray([pdays[days[i]] for i in keep], dtype=np.int64)
+
+    members_list = [[col[t] for _, t in theme_stocks.get(th, []) if t in col] for th in themes]
+    S = max([len(m) for m in members_list] + [1])
+    members = np.full((len(themes), S), -1, dtype=np.int64)
+    for k, m in enumerate(members_list):
+        members[k, :len(m)] = m
+
+    close = panel.close
+    prev = np.full_like(close, np.nan)
+    prev[1:] = close[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(prev > 0, (close / prev - 1.0) * 100.0, np.nan)
+        fwd = {}
+        for h in horizons:
+            ahead = np.full_like(close, np.nan)
+            if h < len(close):
+                ahead[:-h] = close[h:]
+            fwd[h] = (ahead / close - 1.0)[rows]
+    tech = compute(panel)["tech_score"] if len(panel.tickers) else np.empty_like(close)
+    # 벤치마크: 테마 종목 전체 동일가중
+    universe = sorted({j for m in members_list for j in m})
+    counts, pos = (counts[keep], pos[keep]) if len(keep) else (counts[:0], pos[:0])
+    order = np.lexsort((pos, -counts), axis=-1)  # 건수 내림차순 → 기록 순서 → 테마 이름순 (theme_rows와 같은 순서)
+    return BacktestData(
+        [days[i] for i in keep], themes, panel.tickers, counts, order,
+        members, pct[rows], panel.volume[rows], tech[rows], fwd, np.asarray(universe, dtype=np.int64),
+    )
+
+
+# ---------- 규칙 (벡터화) ----------
+def select(data: BacktestData, params: Optional[Mapping[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    pick_promising_by_theme_once를 모든 날짜에 동시 적용 (같은 입력이면 같은 픽 · 같은 순서).
+    → (picks (D, top_n) 종목 열 번호 -1=없음, scores (D, top_n) AI점수), 점수 내림차순
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    M, top_n = float(p["max_abs_move"]), int(p["top_n"])
+    D = len(data)
+    if not D or not len(data.themes) or not len(data.tickers) or top_n <= 0:
+        return np.full((D, max(top_n, 0)), -1, dtype=np.int64), np.full((D, max(top_n, 0)), np.nan)
+
+    pct, vol = data.pct, data.volume
+    with np.errstate(invalid="ignore"):
+        ok = ~np.isnan(pct) & (np.abs(pct) <= p["outlier_drop"]) & ~(vol < p["min_volume"])  # 거래량 없음 → 통과
+    move = np.clip(pct, -M, M) / M
+    freq = np.minimum(data.counts / p["freq_cap"], 1.0)
+
+    pad = data.members < 0
+    mem = np.where(pad, 0, data.members)                                  # (K, S)
+    score = freq[:, :, None] * p["freq_weight"] + move[:, mem] * p["move_weight"]  # (D, K, S)
+    tw = float(p.get("tech_weight") or 0.0)
+    if tw:
+        tech = data.tech[:, mem]
+        score = np.where(np.isnan(tech), score, score * (1 - tw) + tech * tw)
+    score = np.round(score * 100, 2)  # 원 규칙은 반올림한 AI점수로 비교/정렬
+    score = np.where(ok[:, mem] & ~pad, score, -np.inf)
+
+    best_s = score.argmax(axis=2)                                         # 동점이면 먼저 나온 종목 (원 규칙과 같음)
+    best = np.take_along_axis(score, best_s[:, :, None], axis=2)[:, :, 0]  # (D, K)
+    best_col = mem[np.arange(mem.shape[0])[None, :], best_s]              # (D, K)
+    has = np.isfinite(best) & (data.counts > 0)
+
+    # 건수 많은 테마부터 훑어 픽이 있는 테마 top_n개 (원 규칙의 조기 종료와 같음)
+    order = data.order
+    has_o = np.take_along_axis(has, order, axis=1)
+    taken = has_o & (np.cumsum(has_o, axis=1) <= top_n)
+    sc = np.where(taken, np.take_along_axis(best, order, axis=1), -np.inf)
+    cols = np.take_along_axis(best_col, order, axis=1)
+
+    if sc.shape[1] < top_n:  # 테마 수 < top_n → 빈 칸 채움
+        extra = top_n - sc.shape[1]
+        sc = np.concatenate([sc, np.full((D, extra), -np.inf)], axis=1)
+        cols = np.concatenate([cols, np.zeros((D, extra), dtype=np.int64)], axis=1)
+    rank = np.argsort(-sc, axis=1, kind="stable")[:, :top_n]
+    top_sc = np.take_along_axis(sc, rank, axis=1)
+    picks = np.where(np.isfinite(top_sc), np.take_along_axis(cols, rank, axis=1), -1)
+    return picks, np.where(np.isfinite(top_sc), top_sc, np.nan)
+
+
+def _nanmean_rows(x: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    n = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, np.where(valid, x, 0.0).sum(axis=1) / np.maximum(n, 1), np.nan)
+
+
+def evaluate(data: BacktestData, picks: np.ndarray) -> Dict[str, float]:
+    """픽 동일가중 포트폴리오의 보유기간별 평균 수익률(%) · 적중률 · 샤프 · 벤치마크 초과수익"""
+    out: Dict[str, float] = {"days": float(len(data)), "picks": float((picks >= 0).sum())}
+    safe = np.where(picks >= 0, picks, 0)
+    for h, fwd in data.fwd.items():
+        r = np.take_along_axis(fwd, safe, axis=1)
+        port = _nanmean_rows(r, (picks >= 0) & ~np.isnan(r))
+        uni = fwd[:, data.universe] if len(data.universe) else np.full((len(data), 0), np.nan)
+        bench = _nanmean_rows(uni, ~np.isnan(uni))
+        live = ~np.isnan(port)
+        x = port[live]
+        sd = x.std(ddof=1) if len(x) > 1 else np.nan
+        out[f"ret_{h}d"] = float(x.mean() * 100) if len(x) else np.nan
+        out[f"hit_{h}d"] = float((x > 0).mean()) if len(x) else np.nan
+        out[f"sharpe_{h}d"] = float(x.mean() / sd * np.sqrt(252 / h)) if len(x) > 1 and sd > 0 else np.nan
+        ex = (port - bench)[live & ~np.isnan(bench)]
+        out[f"excess_{h}d"] = float(ex.mean() * 100) if len(ex) else np.nan
+    return out
+
+
+def run(data: BacktestData, params: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    picks, _ = select(data, p)
+    return {**p, **evaluate(data, picks)}
+
+
+# ---------- 파라미터 그리드 (프로세스 풀) ----------
+def param_grid(**axes: Iterable[float]) -> List[Dict[str, float]]:
+    """param_grid(max_abs_move=[15, 25], top_n=[3, 5]) → 조합 목록 (지정 안 한 값은 DEFAULT_PARAMS)"""
+    unknown = set(axes) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"알 수 없는 파라미터: {sorted(unknown)}")
+    keys = list(axes)
+    return [{**DEFAULT_PARAMS, **dict(zip(keys, vals))} for vals in itertools.product(*(list(axes[k]) for k in keys))]
+
+
+_WORKER_DATA: Optional[BacktestData] = None
+
+
+def _init_worker(data: BacktestData) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _run_worker(params: Dict[str, float]) -> Dict[str, float]:
+    return run(_WORKER_DATA, params)  # type: ignore[arg-type]
+
+
+def run_grid(data: BacktestData, grid: Sequence[Mapping[str, float]], workers: Optional[int] = None) -> "pd.DataFrame":
+    """조합별 run 결과 DataFrame (grid 순서). workers=1이면 현재 프로세스에서 순차 실행."""
+    import pandas as pd
+    workers = workers or os.cpu_count() or 1
+    grid = [dict(g) for g in grid]
+    if workers <= 1 or len(grid) <= 1:
+        rows = [run(data, g) for g in grid]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = min(workers, len(grid))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as ex:
+            rows = list(ex.map(_run_worker, grid, chunksize=max(1, len(grid) // (workers * 4))))
+    return pd.DataFrame(rows)
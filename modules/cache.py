@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+# modules/cache.py
+# 교체 가능한 캐시 백엔드 (프로세스 내 메모리 · 로컬 공유 SQLite · Redis 호환)
+#
+# 선택: NEWS_CACHE_BACKEND=memory(기본)|sqlite|redis
+#   sqlite: NEWS_CACHE_PATH (기본 data/cache.sqlite) - 같은 머신의 모든 프로세스가 공유
+#   redis : NEWS_CACHE_URL  (기본 redis://127.0.0.1:6379/0) - Redis 프로토콜 호환 서버면 무엇이든
+#           값은 pickle → 서버에 쓸 수 있는 누구나 워커에서 코드 실행 가능. 신뢰하는 사설 서버만 쓰거나
+#           NEWS_CACHE_SECRET 을 설정 (모든 워커 동일 값) → HMAC-SHA256 서명이 맞는 값만 unpickle
+# 네임스페이스별 TTL: NAMESPACE_TTLS, 환경변수 NEWS_CACHE_TTL_<NS> 로 덮어쓰기 (예: NEWS_CACHE_TTL_QUOTES=10)
+
+from __future__ import annotations
+import functools
+import os
+import pickle
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from modules import metrics, singleflight
+from modules.singleflight import FlightTimeout, SingleFlight
+
+NAMESPACE_TTLS: Dict[str, float] = {
+    "news": 600,      # 뉴스 RSS
+    "quotes": 30,     # 현재가
+    "ohlc": 3600,     # 일봉 이력
+    "indicators": 86400,  # 기술적 지표 (키에 거래일 포함)
+    "reports": 86400, # 리포트/집계 결과
+}
+DEFAULT_TTL = 300
+NEGATIVE_TTL = 60  # 빈/실패 결과 짧은 보관 (NoStore(value, ttl=NEGATIVE_TTL)) → 죽은 티커를 재실행마다 다시 받지 않음
+
+# ----- 직렬화: pickle(protocol 5) + 큰 값은 zlib 압축, 1바이트 헤더로 구분 -----
+_RAW, _ZLIB = b"\x00", b"\x01"
+COMPRESS_MIN_BYTES = 1024
+
+def dumps(value: Any) -> bytes:
+    raw = pickle.dumps(value, protocol=5)
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        z = zlib.compress(raw, 3)
+        if len(z) < len(raw):
+            return _ZLIB + z
+    return _RAW + raw
+
+def loads(blob: bytes) -> Any:
+    head, body = blob[:1], blob[1:]
+    if head == _ZLIB:
+        body = zlib.decompress(body)
+    return pickle.loads(body)
+
+
+def ttl_for(namespace: str) -> float:
+    env = os.environ.get(f"NEWS_CACHE_TTL_{namespace.upper()}")
+    if env:
+        try:
+            return float(env)
+        except ValueError:
+            pass
+    return NAMESPACE_TTLS.get(namespace, DEFAULT_TTL)
+
+
+class CacheBackend:
+    """
+    get → (hit 여부, 값). None도 정상 값으로 저장될 수 있으므로 hit 플래그로 구분한다.
+    copy_values: 호출자마다 독립된 값을 준다 (직렬화 백엔드는 항상, 메모리 백엔드는 설정) → copy()도 같은 규칙.
+    """
+    name = "base"
+    copy_values = True
+
+    def copy(self, value: Any) -> Any:
+        """이 백엔드의 값 의미대로 복사 (합쳐진 호출의 팔로워에게 줄 때 사용)"""
+        if not self.copy_values:
+            return value
+        import copy
+        return copy.deepcopy(value)
+
+    def get(self, ns: str, key: str) -> Tuple[bool, Any]:
+        raise NotImplementedError
+
+    def set(self, ns: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, ns: str, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, ns: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def _hit(self, ns: str, hit: bool) -> None:
+        metrics.inc("cache_requests_total", cache=self.name, namespace=ns, result="hit" if hit else "miss")
+
+    def _evict(self, ns: str, n: int = 1, reason: str = "expired") -> None:
+        if n:
+            metrics.inc("cache_evictions_total", n, cache=self.name, namespace=ns, reason=reason)
+
+
+class MemoryBackend(CacheBackend):
+    """
+    프로세스 내 dict. 직렬화 없이 보관 (가장 빠름, 공유 안 됨).
+    copy_values=True(기본): set/get 때 deepcopy → 호출자가 받은 값을 고쳐도 캐시는 그대로 (SQLite/Redis와 같은 의미).
+    copy_values=False: 객체를 그대로 공유 - 값을 절대 수정하지 않는 호출자만.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000, copy_values: bool = True):
+        self.max_entries = max_entries
+        self.copy_values = copy_values
+        self._d: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ns, key):
+        now = time.time()
+        with self._lock:
+            v = self._d.get((ns, key))
+            if v is not None and v[0] <= now:
+                del self._d[(ns, key)]
+                self._evict(ns)
+                v = None
+        self._hit(ns, v is not None)
+        if v is None:
+            return False, None
+        return True, self.copy(v[1])
+
+    def set(self, ns, key, value, ttl=None):
+        exp = time.time() + (ttl_for(ns) if ttl is None else ttl)
+        value = self.copy(value)
+        with self._lock:
+            if len(self._d) >= self.max_entries and (ns, key) not in self._d:
+                self._purge_locked()
+            self._d[(ns, key)] = (exp, value)
+
+    def _purge_locked(self):
+        now = time.time()
+        dead = [k for k, (exp, _) in self._d.items() if exp <= now]
+        for k in dead:
+            del self._d[k]
+            self._evict(k[0])
+        while len(self._d) >= self.max_entries:  # 그래도 가득 차면 가장 오래된 항목부터
+            k = next(iter(self._d))
+            del self._d[k]
+            self._evict(k[0], reason="capacity")
+
+    def delete(self, ns, key):
+        with self._lock:
+            self._d.pop((ns, key), None)
+
+    def clear(self, ns=None):
+        with self._lock:
+            if ns is None:
+                self._d.clear()
+            else:
+                for k in [k for k in self._d if k[0] == ns]:
+                    del self._d[k]
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    로컬 파일 하나를 모든 프로세스가 공유 (WAL + mmap I/O).
+    쓰기는 단일 트랜잭션의 INSERT OR REPLACE → 다른 프로세스는 항상 완전한 값만 본다.
+    """
+    name = "sqlite"
+    PURGE_EVERY = 500  # set N회마다 만료 행 정리
+
+    def __init__(self, path: str = os.path.join("data", "cache.sqlite"), mmap_bytes: int = 64 << 20):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._sets = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+              ns TEXT NOT NULL,
+              key TEXT NOT NULL,
+              expires REAL NOT NULL,
+              value BLOB NOT NULL,
+              PRIMARY KEY (ns, key)
+            ) WITHOUT ROWID
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.conn = conn
+        return conn
+
+    def get(self, ns, key):
+        now = time.time()
+        row = self._conn().execute("SELECT expires, value FROM cache WHERE ns=? AND key=?", (ns, key)).fetchone()
+        if row is not None and row[0] <= now:
+            # 만료된 행만 지움 - SELECT 이후 다른 프로세스가 새로 쓴 값은 남긴다
+            self._conn().execute("DELETE FROM cache WHERE ns=? AND key=? AND expires <= ?", (ns, key, now))
+            self._evict(ns)
+            row = None
+        self._hit(ns, row is not None)
+        if row is None:
+            return False, None
+        return True, loads(row[1])
+
+    def set(self, ns, key, value, ttl=None):
+        exp = time.time() + (ttl_for(ns) if ttl is None else ttl)
+        blob = dumps(value)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR REPLACE INTO cache(ns, key, expires, value) VALUES (?, ?, ?, ?)",
+                         (ns, key, exp, blob))
+        self._sets += 1
+        if self._sets % self.PURGE_EVERY == 0:
+            self.purge()
+
+    def purge(self) -> int:
+        cur = self._conn().execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        self._evict("*", cur.rowcount or 0)
+        return cur.rowcount or 0
+
+    def delete(self, ns, key):
+        self._conn().execute("DELETE FROM cache WHERE ns=? AND key=?", (ns, key))
+
+    def clear(self, ns=None):
+        if ns is None:
+            self._conn().execute("DELETE FROM cache")
+        else:
+            self._conn().execute("DELETE FROM cache WHERE ns=?", (ns,))
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis 프로토콜 호환 저장소 (Redis/Valkey/KeyDB 등). TTL은 서버가 관리(PX).
+    client를 직접 넘기면 redis 패키지 없이도 같은 인터페이스(get/set/delete/scan_iter)의 객체로 교체 가능.
+    secret(기본 NEWS_CACHE_SECRET): 있으면 값 앞에 HMAC-SHA256을 붙여 저장하고, 서명이 맞지 않는 값은 unpickle하지 않고 미스.
+    없으면 서버를 신뢰한다 (외부에서 쓸 수 없는 사설 인스턴스에서만 사용).
+    """
+    name = "redis"
+    MAC_BYTES = 32
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", prefix: str = "ainews", client: Any = None,
+                 secret: Optional[str] = None):
+        if client is None:
+            import redis  # type: ignore
+            client = redis.Redis.from_url(url)
+        self.r = client
+        self.prefix = prefix
+        secret = os.environ.get("NEWS_CACHE_SECRET") if secret is None else secret
+        self._secret = secret.encode("utf-8") if secret else None
+
+    def _k(self, ns: str, key: str) -> str:
+        return f"{self.prefix}:{ns}:{key}"
+
+    def _mac(self, blob: bytes) -> bytes:
+        import hashlib, hmac
+        return hmac.new(self._secret, blob, hashlib.sha256).digest()  # type: ignore[arg-type]
+
+    def _seal(self, blob: bytes) -> bytes:
+        return self._mac(blob) + blob if self._secret else blob
+
+    def _open(self, blob: bytes) -> Optional[bytes]:
+        """서명 확인 → 본문 (불일치/서명 없음이면 None)"""
+        if not self._secret:
+            return blob
+        import hmac
+        mac, body = blob[:self.MAC_BYTES], blob[self.MAC_BYTES:]
+        return body if hmac.compare_digest(mac, self._mac(body)) else None
+
+    def get(self, ns, key):
+        blob = self.r.get(self._k(ns, key))
+        body = self._open(blob) if blob is not None else None
+        if blob is not None and body is None:
+            self._evict(ns, reason="bad_signature")  # 다른 키로 서명했거나 외부에서 쓴 값
+        self._hit(ns, body is not None)
+        return (True, loads(body)) if body is not None else (False, None)
+
+    def set(self, ns, key, value, ttl=None):
+        ttl = ttl_for(ns) if ttl is None else ttl
+        self.r.set(self._k(ns, key), self._seal(dumps(value)), px=max(1, int(ttl * 1000)))
+
+    def delete(self, ns, key):
+        self.r.delete(self._k(ns, key))
+
+    def clear(self, ns=None):
+        pattern = f"{self.prefix}:{ns}:*" if ns else f"{self.prefix}:*"
+        keys = list(self.r.scan_iter(match=pattern, count=500))
+        if keys:
+            self.r.delete(*keys)
+
+
+# ----- 전역 백엔드 -----
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+def _from_env() -> CacheBackend:
+    kind = os.environ.get("NEWS_CACHE_BACKEND", "memory").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(os.environ.get("NEWS_CACHE_PATH", os.path.join("data", "cache.sqlite")))
+    if kind == "redis":
+        return RedisBackend(os.environ.get("NEWS_CACHE_URL", "redis://127.0.0.1:6379/0"))
+    return MemoryBackend()
+
+def get_cache() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _from_env()
+    return _backend
+
+def set_cache(backend: CacheBackend) -> None:
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+class NoStore:
+    """
+    @cached 함수가 NoStore(value)를 반환하면 호출자(합쳐진 대기자 포함)에게는 value를 주고 저장하지 않는다.
+    빈 응답 · 일부 실패처럼 TTL 동안 붙잡고 있으면 안 되는 결과용.
+    ttl을 주면 네임스페이스 TTL 대신 그 시간(초)만 저장 (부정 캐시: 같은 실패를 매번 다시 호출하지 않게).
+    """
+    __slots__ = ("value", "ttl")
+
+    def __init__(self, value: Any, ttl: Optional[float] = None):
+        self.value = value
+        self.ttl = ttl
+
+
+def _unwrap(value: Any) -> Tuple[bool, Any, Optional[float]]:
+    """→ (저장 여부, 값, TTL 덮어쓰기)"""
+    if isinstance(value, NoStore):
+        return value.ttl is not None and value.ttl > 0, value.value, value.ttl
+    return True, value, None
+
+
+# ----- 새로고침: 공유 저장소를 비우지 않고 이 프로세스만 다시 불러와 덮어쓰기 -----
+_refresh_lock = threading.Lock()
+_refresh_at: Dict[str, float] = {}              # ns → refresh() 시각
+_refreshed: Dict[Tuple[str, str], float] = {}   # (ns, key) → 그 이후 다시 불러온 시각
+
+def refresh(*namespaces: str) -> None:
+    """
+    이 프로세스에서 각 키를 다음에 조회할 때 캐시를 건너뛰고 원함수로 다시 불러와 저장한다.
+    clear()와 달리 다른 워커는 기존 값을 계속 쓰다가 갱신된 값을 받는다 (공유 백엔드 동시 미스 폭주 방지).
+    """
+    now = time.time()
+    with _refresh_lock:
+        for ns in namespaces:
+            _refresh_at[ns] = now
+        for k in [k for k in _refreshed if k[0] in namespaces]:
+            del _refreshed[k]
+
+def _stale(ns: str, key: str) -> bool:
+    t = _refresh_at.get(ns)
+    return t is not None and _refreshed.get((ns, key), 0.0) < t
+
+def _mark_refreshed(ns: str, key: str, at: float) -> None:
+    if ns in _refresh_at:
+        with _refresh_lock:
+            _refreshed[(ns, key)] = at
+
+
+def _signature(fn: Callable):
+    # inspect는 import 비용이 커서 첫 호출 때 로드, 함수별 signature는 한 번만 계산
+    sig = getattr(fn, "__cache_signature__", None)
+    if sig is None:
+        import inspect
+        try:
+            sig = inspect.signature(fn)
+        except (TypeError, ValueError):
+            sig = False
+        try:
+            fn.__cache_signature__ = sig
+        except AttributeError:
+            pass
+    return sig
+
+
+def make_key(fn: Callable, args: tuple, kwargs: dict) -> str:
+    """기본값을 채운 인자 기준 키 → f(x) 와 f(x, days=3) 가 같은 키"""
+    sig = _signature(fn)
+    try:
+        if not sig:
+            raise TypeError
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arg_repr = repr(tuple(bound.arguments.items()))
+    except TypeError:
+        arg_repr = repr((args, sorted(kwargs.items())))
+    name = f"{fn.__module__}.{fn.__qualname__}"
+    if len(arg_repr) > 160:
+        import hashlib
+        arg_repr = hashlib.sha1(arg_repr.encode("utf-8")).hexdigest()
+    return f"{name}:{arg_repr}"
+
+
+def cached(namespace: str, ttl: Optional[float] = None, coalesce: bool = True):
+    """
+    @cached("news") - 전역 백엔드에 결과를 저장. 예외와 NoStore(...) 결과는 캐시하지 않는다
+    (NoStore(..., ttl=초)는 그 시간만 저장).
+    백엔드 장애 시 캐시 없이 원함수를 호출한다.
+    coalesce=True: 캐시 미스 때 같은 키 동시 호출은 1건만 실행하고 결과/예외를 공유 (modules.singleflight).
+      팔로워가 singleflight.DEFAULT_TIMEOUT 넘게 기다리면 합치기를 포기하고 직접 호출한다.
+    wrapper.aio(*args, **kwargs): asyncio 호출자용 (대기 중 스레드를 점유하지 않음).
+    """
+    def deco(fn):
+        flight = SingleFlight(namespace) if coalesce else None
+
+        def lookup(key):
+            try:
+                return get_cache().get(namespace, key)
+            except Exception:
+                return False, None
+
+        def load(key, args, kwargs, stale=False):
+            if flight is not None and not stale:  # 앞선 리더가 방금 저장했을 수 있음 → 한 번 더 확인
+                hit, value = lookup(key)
+                if hit:
+                    return value
+            started = time.time()
+            store, value, short_ttl = _unwrap(fn(*args, **kwargs))
+            if not store:
+                return value
+            try:
+                get_cache().set(namespace, key, value, short_ttl if short_ttl is not None else ttl)
+            except Exception:
+                pass
+            _mark_refreshed(namespace, key, started)
+            return value
+
+        def lead(led, key, args, kwargs, stale):
+            led.append(True)  # 이 호출이 리더 → 결과 객체를 그대로 가져감
+            return load(key, args, kwargs, stale)
+
+        def follow(value):
+            # 팔로워는 리더와 같은 객체를 받으므로 캐시 조회와 같은 복사 규칙 적용 (공유 가변 객체 방지)
+            try:
+                return get_cache().copy(value)
+            except Exception:
+                return value
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(fn, args, kwargs)
+            stale = _stale(namespace, key)
+            if not stale:
+                hit, value = lookup(key)
+                if hit:
+                    return value
+            if flight is None:
+                return load(key, args, kwargs, stale)
+            led = []
+            try:
+                value = flight.do(key, lead, led, key, args, kwargs, stale, timeout=singleflight.DEFAULT_TIMEOUT)
+            except FlightTimeout:
+                return load(key, args, kwargs, stale)
+            return value if led else follow(value)
+
+        async def aio(*args, **kwargs):
+            key = make_key(fn, args, kwargs)
+            stale = _stale(namespace, key)
+            if not stale:
+                hit, value = lookup(key)
+                if hit:
+                    return value
+            if flight is not None:
+                led = []
+                try:
+                    value = await flight.do_async(key, lead, led, key, args, kwargs, stale,
+                                                  timeout=singleflight.DEFAULT_TIMEOUT)
+                    return value if led else follow(value)
+                except FlightTimeout:
+                    pass
+            import asyncio
+            return await asyncio.get_running_loop().run_in_executor(None, load, key, args, kwargs, stale)
+
+        wrapper.uncached = lambda *args, **kwargs: _unwrap(fn(*args, **kwargs))[1]  # type: ignore[attr-defined]
+        wrapper.cache_clear = lambda: get_cache().clear(namespace)  # type: ignore[attr-defined]
+        wrapper.aio = aio  # type: ignore[attr-defined]
+        wrapper.flight = flight  # type: ignore[attr-defined]
+        return wrapper
+    return deco
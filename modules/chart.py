@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# modules/chart.py
+# 캔들차트 (matplotlib은 이 모듈을 import할 때만 로드)
+
+from __future__ import annotations
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+
+def plot_candles(df: pd.DataFrame, title: str = "", lookback: int = 60):
+    if df is None or df.empty:
+        fig, ax = plt.subplots(figsize=(8, 3))
+        ax.text(0.5, 0.5, "차트 데이터 없음", ha="center", va="center")
+        ax.axis("off")
+        return fig
+    data = df.tail(max(20, lookback)).copy()
+    x = np.arange(len(data))
+    o, h, l, c = data["Open"].values, data["High"].values, data["Low"].values, data["Close"].values
+    fig, ax = plt.subplots(figsize=(8, 3))
+    width = 0.6
+    for i in range(len(data)):
+        color = "#d93025" if c[i] >= o[i] else "#1a73e8"
+        ax.vlines(x=i, ymin=l[i], ymax=h[i], colors=color, linewidth=1)
+        top, bottom = max(o[i], c[i]), min(o[i], c[i])
+        height = max(top - bottom, 1e-6)
+        ax.add_patch(plt.Rectangle((i - width/2, bottom), width, height, color=color, alpha=0.8, linewidth=0))
+    ax.set_xlim(-1, len(data))
+    ax.set_title(title or "일봉 차트", fontsize=11)
+    ax.grid(True, linestyle="--", alpha=0.25)
+    step = max(1, len(data)//6)
+    ax.set_xticks(x[::step])
+    ax.set_xticklabels([data.index[i].strftime("%m-%d") for i in x[::step]])
+    ax.tick_params(axis='x', labelsize=9); ax.tick_params(axis='y', labelsize=9)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+# modules/indicators.py
+# 기술적 지표 엔진: (날짜 × 종목) 행렬에서 테마 유니버스 전체를 한 번에 계산
+#
+#   ind = theme_indicators(["005930.KS", "000660.KS", ...])   # 마감된 거래일 단위 캐시 ("indicators" 네임스페이스)
+#   ind.value("005930.KS", "rsi14"), ind.latest("005930.KS"), ind.latest_frame()
+#
+# - 모든 지표는 축 0(날짜) 방향 누적합 기반 이동창 → 종목 수와 무관하게 numpy 연산 몇 번
+# - 창 안에 결측(NaN)이 있으면 그 날 지표도 NaN (상장 전/거래정지 구간이 값에 섞이지 않도록)
+
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from modules.cache import NEGATIVE_TTL, NoStore, cached, ttl_for
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+KST = timezone(timedelta(hours=9))
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+ANNUAL_DAYS = 252
+
+
+# ---------- (날짜 × 종목) 패널 ----------
+class Panel:
+    """OHLCV 행렬 묶음. 각 필드는 float64 (T, N), 없는 값은 NaN."""
+    __slots__ = ("dates", "tickers", "open", "high", "low", "close", "volume")
+
+    def __init__(self, dates: np.ndarray, tickers: List[str], open, high, low, close, volume):
+        self.dates, self.tickers = dates, list(tickers)
+        self.open, self.high, self.low, self.close, self.volume = open, high, low, close, volume
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def build_panel(frames: Mapping[str, "pd.DataFrame"]) -> Panel:
+    """{ticker: get_ohlc DataFrame} → 날짜 합집합 기준으로 정렬된 Panel"""
+    import pandas as pd
+    parts = {}
+    for t, df in frames.items():
+        if df is None or df.empty:
+            continue
+        if isinstance(df.columns, pd.MultiIndex):  # yfinance 버전에 따라 (필드, 티커) 2단 컬럼
+            df = df.droplevel(-1, axis=1)
+        parts[t] = df[list(FIELDS)]
+    tickers = list(parts)
+    if not tickers:
+        empty = np.empty((0, 0))
+        return Panel(np.empty(0, dtype="datetime64[D]"), [], empty, empty, empty, empty, empty)
+    wide = pd.concat(parts, axis=1).sort_index()
+    cols = {f: wide.xs(f, axis=1, level=1).reindex(columns=tickers).to_numpy(dtype=float) for f in FIELDS}
+    dates = wide.index.to_numpy().astype("datetime64[D]")
+    return Panel(dates, tickers, cols["Open"], cols["High"], cols["Low"], cols["Close"], cols["Volume"])
+
+
+# ---------- 이동창 기본 연산 ----------
+def _shift(x: np.ndarray, n: int = 1) -> np.ndarray:
+    out = np.full_like(x, np.nan, dtype=float)
+    if 0 < n < len(x):
+        out[n:] = x[:-n]
+    return out
+
+
+def rolling_sum(x: np.ndarray, w: int) -> np.ndarray:
+    """축 0 방향 w일 합 (창 안에 NaN이 있으면 NaN)"""
+    out = np.full(x.shape, np.nan)
+    if len(x) < w:
+        return out
+    valid = ~np.isnan(x)
+    c = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    k = np.cumsum(valid, axis=0)
+    s, n = c[w - 1:].copy(), k[w - 1:].copy()
+    s[1:] -= c[:-w]
+    n[1:] -= k[:-w]
+    out[w - 1:] = np.where(n == w, s, np.nan)
+    return out
+
+
+def sma(x: np.ndarray, w: int) -> np.ndarray:
+    return rolling_sum(x, w) / w
+
+
+def rolling_std(x: np.ndarray, w: int) -> np.ndarray:
+    """표본 표준편차 (ddof=1)"""
+    m, m2 = sma(x, w), sma(x * x, w)
+    return np.sqrt(np.maximum(m2 - m * m, 0.0) * w / (w - 1))
+
+
+# ---------- 지표 ----------
+def log_returns(close: np.ndarray) -> np.ndarray:
+    out = np.full(close.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.log(close[1:] / close[:-1])
+    return out
+
+
+def pct_change(close: np.ndarray, n: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (close / _shift(close, n) - 1.0) * 100.0
+
+
+def rsi(close: np.ndarray, w: int = 14) -> np.ndarray:
+    """단순평균 RSI (Cutler). 손실이 0이면 100, 변동이 없으면 50."""
+    diff = np.full(close.shape, np.nan)
+    diff[1:] = close[1:] - close[:-1]
+    gain, loss = sma(np.maximum(diff, 0.0), w), sma(np.maximum(-diff, 0.0), w)  # NaN은 그대로 전파
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + gain / loss)
+    out = np.where((loss == 0) & (gain > 0), 100.0, out)
+    return np.where((loss == 0) & (gain == 0), 50.0, out)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, w: int = 14) -> np.ndarray:
+    prev = _shift(close, 1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+    return sma(tr, w)
+
+
+def volatility(close: np.ndarray, w: int = 20) -> np.ndarray:
+    """연율화 변동성(%) = 로그수익률 w일 표준편차 × √252"""
+    return rolling_std(log_returns(close), w) * np.sqrt(ANNUAL_DAYS) * 100.0
+
+
+def volume_zscore(volume: np.ndarray, w: int = 20) -> np.ndarray:
+    """당일 거래량을 직전 w일 평균/표준편차로 표준화"""
+    m, s = _shift(sma(volume, w), 1), _shift(rolling_std(volume, w), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(s > 0, (volume - m) / s, np.nan)
+
+
+def rolling_corr(returns: np.ndarray, w: int = 20, last: int = 5) -> np.ndarray:
+    """
+    최근 last일 각각의 w일 종목 간 상관행렬 → (last, N, N).
+    창 안에 결측이 있는 종목의 행/열은 NaN.
+    """
+    T, N = returns.shape
+    last = max(0, min(last, T - w + 1))
+    if not last or not N:
+        return np.full((last, N, N), np.nan)
+    win = np.lib.stride_tricks.sliding_window_view(returns[T - w - last + 1:], w, axis=0)  # (last, N, w)
+    z = win - win.mean(axis=2, keepdims=True)
+    sd = np.sqrt((z * z).sum(axis=2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = z / sd[..., None]
+        return np.einsum("kiw,kjw->kij", z, z)
+
+
+def _clip(x: np.ndarray) -> np.ndarray:
+    return np.clip(x, -1.0, 1.0)
+
+
+def technical_score(close: np.ndarray, ma20: np.ndarray, rsi14: np.ndarray, vol_z: np.ndarray) -> np.ndarray:
+    """
+    -1~1 기술점수 = 평균(추세, 모멘텀, 거래량). 없는 항목은 빼고 평균.
+    추세: 20일선 대비 이격 10% = 1, 모멘텀: RSI 50→70 구간 가점 · 70 초과는 과열 감점, 거래량: z 3 = 1
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trend = _clip((close / ma20 - 1.0) * 10.0)
+    momentum = _clip(np.where(rsi14 > 70, (85.0 - rsi14) / 15.0, (rsi14 - 50.0) / 20.0))
+    volume = _clip(vol_z / 3.0)
+    terms = np.stack([trend, momentum, volume])
+    n = (~np.isnan(terms)).sum(axis=0)
+    with np.errstate(invalid="ignore"):
+        return np.where(n > 0, np.nansum(terms, axis=0) / np.maximum(n, 1), np.nan)
+
+
+# ---------- 결과 묶음 ----------
+class Indicators:
+    """지표 이름 → (T, N) 행렬 + 최근 상관행렬. pickle 가능 (공유 캐시 백엔드 저장용)."""
+
+    def __init__(self, dates: np.ndarray, tickers: List[str], values: Dict[str, np.ndarray], corr: np.ndarray):
+        self.dates, self.tickers, self.values, self.corr = dates, list(tickers), values, corr
+        self._col = {t: i for i, t in enumerate(self.tickers)}
+
+    def __getstate__(self):
+        return {"dates": self.dates, "tickers": self.tickers, "values": self.values, "corr": self.corr}
+
+    def __setstate__(self, state):
+        self.__init__(state["dates"], state["tickers"], state["values"], state["corr"])
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._col
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[name]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.values)
+
+    def value(self, ticker: str, name: str, row: int = -1) -> Optional[float]:
+        j = self._col.get(ticker)
+        arr = self.values.get(name)
+        if j is None or arr is None or not len(arr):
+            return None
+        v = float(arr[row, j])
+        return None if np.isnan(v) else v
+
+    def latest(self, ticker: str) -> Dict[str, Optional[float]]:
+        return {name: self.value(ticker, name) for name in self.values}
+
+    def latest_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+        data = {name: arr[-1] if len(arr) else np.full(len(self.tickers), np.nan) for name, arr in self.values.items()}
+        return pd.DataFrame(data, index=pd.Index(self.tickers, name="ticker"))
+
+    def mean_corr(self, tickers: Iterable[str], row: int = -1) -> Optional[float]:
+        """tickers 사이 평균 쌍별 상관 (최근 창 기준)"""
+        idx = [self._col[t] for t in dict.fromkeys(tickers) if t in self._col]
+        if len(idx) < 2 or not len(self.corr):
+            return None
+        sub = self.corr[row][np.ix_(idx, idx)]
+        v = np.nanmean(sub[~np.eye(len(idx), dtype=bool)])
+        return None if np.isnan(v) else float(v)
+
+
+def compute(panel: Panel, ma_windows=(5, 20, 60), rsi_window: int = 14, atr_window: int = 14,
+            vol_window: int = 20, corr_window: int = 20, corr_days: int = 5) -> Indicators:
+    """Panel → Indicators (모든 종목 동시 계산)"""
+    c = panel.close
+    values: Dict[str, np.ndarray] = {"close": c}
+    for w in ma_windows:
+        values[f"ma{w}"] = sma(c, w)
+    values["ret5"] = pct_change(c, 5)
+    values["ret20"] = pct_change(c, 20)
+    values[f"rsi{rsi_window}"] = rsi(c, rsi_window)
+    a = atr(panel.high, panel.low, c, atr_window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values[f"atr_pct{atr_window}"] = a / c * 100.0
+    values[f"vol{vol_window}"] = volatility(c, vol_window)
+    values[f"volume_z{vol_window}"] = volume_zscore(panel.volume, vol_window)
+    corr = rolling_corr(log_returns(c), corr_window, corr_days)
+    values["avg_corr"] = np.full(c.shape, np.nan)  # 다른 종목들과의 평균 상관
+    if len(corr) and len(panel.tickers) > 1:
+        off = np.where(np.eye(len(panel.tickers), dtype=bool), np.nan, corr)
+        n = (~np.isnan(off)).sum(axis=2)
+        values["avg_corr"][-len(corr):] = np.where(n > 0, np.nansum(off, axis=2) / np.maximum(n, 1), np.nan)
+    ma20 = values.get("ma20", sma(c, 20))
+    values["tech_score"] = technical_score(c, ma20, values[f"rsi{rsi_window}"], values[f"volume_z{vol_window}"])
+    return Indicators(panel.dates, panel.tickers, values, corr)
+
+
+# ---------- 마감된 거래일 단위 캐시 ----------
+def trading_day(now: Optional[datetime] = None, market: str = "KR") -> str:
+    """마지막으로 마감된 거래일 (장 마감 전이면 전 거래일, 주말 → 직전 금요일, 공휴일은 구분하지 않음)"""
+    from modules.market import last_session
+    return last_session(market, now).isoformat()
+
+
+def load_panel(tickers: Iterable[str], days: int = 120, workers: int = 8) -> Panel:
+    from modules.market import get_ohlc
+    tickers = list(dict.fromkeys(tickers))
+    if workers > 1 and len(tickers) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(tickers))) as ex:
+            frames = dict(zip(tickers, ex.map(lambda t: get_ohlc(t, days=days), tickers)))
+    else:
+        frames = {t: get_ohlc(t, days=days) for t in tickers}
+    return build_panel(frames)
+
+
+def completed_bars(panel: Panel, last: Mapping[str, str]) -> Panel:
+    """
+    각 종목 시장의 마지막 마감 거래일(last: 시장 → ISO 날짜)보다 뒤의 봉(진행 중인 장)을 NaN으로 비우고,
+    모든 종목이 빈 뒤쪽 행은 제거.
+    """
+    from modules.market import market_of
+    if not len(panel):
+        return panel
+    cut = np.array([last[market_of(t)] for t in panel.tickers], dtype="datetime64[D]")
+    late = panel.dates[:, None] > cut[None, :]
+    if not late.any():
+        return panel
+    keep = ~late.all(axis=1)
+    f = lambda x: np.where(late, np.nan, x)[keep]
+    return Panel(panel.dates[keep], panel.tickers, f(panel.open), f(panel.high), f(panel.low),
+                 f(panel.close), f(panel.volume))
+
+
+@cached("indicators")
+def _indicators_for(tickers: tuple, days: int, sessions: Tuple[Tuple[str, str], ...]) -> Indicators:
+    """sessions: ((시장, 마지막 마감 거래일), ...) - 캐시 키가 장중 시각이 아니라 마감된 봉 기준"""
+    panel = completed_bars(load_panel(tickers, days=days), dict(sessions))
+    ind = compute(panel)
+    if len(panel.tickers) < len(tickers):  # 일부 종목 가격 없음 → 하루 동안 붙잡지 않고 NEGATIVE_TTL 동안만 재사용
+        return NoStore(ind, ttl=NEGATIVE_TTL)  # type: ignore[return-value]
+    if len(panel) and str(panel.dates[-1]) < max(d for _, d in sessions):
+        # 마감된 봉이 아직 안 들어옴 (시세 지연 · 공휴일) → 일봉 캐시가 갱신될 때 다시 계산
+        return NoStore(ind, ttl=ttl_for("ohlc"))  # type: ignore[return-value]
+    return ind
+
+
+def theme_indicators(tickers: Iterable[str], days: int = 120, now: Optional[datetime] = None) -> Indicators:
+    """종목 집합의 지표 (같은 마감 거래일 · 같은 종목 집합이면 캐시 재사용, 장중 미완성 봉은 제외)"""
+    from modules.market import market_of
+    tickers = tuple(sorted(set(tickers)))
+    sessions = tuple((m, trading_day(now, m)) for m in sorted({market_of(t) for t in tickers}))
+    return _indicators_for(tickers, int(days), sessions)
+
+
+def universe_indicators(days: int = 120, now: Optional[datetime] = None) -> Indicators:
+    """THEME_STOCKS 전체 종목 지표 - 대시보드/배치/스냅샷 API가 같은 캐시 항목을 공유"""
+    from modules.news import THEME_STOCKS
+    return theme_indicators((t for stocks in THEME_STOCKS.values() for _, t in stocks), days, now)
+
+
+def safe_indicators(tickers: Optional[Iterable[str]] = None) -> Optional[Indicators]:
+    """
+    점수용 지표 (대시보드 · 배치 · 스냅샷 API · 종목 분석 공용). 실패하면 None → 호출자는 지표 없이 계속.
+    tickers 중 유니버스에 없는 종목이 있으면 그 종목들로 따로 계산.
+    """
+    try:
+        ind = universe_indicators()
+        if tickers is not None:
+            tickers = list(tickers)
+            if any(t not in ind for t in tickers):
+                ind = theme_indicators(tickers)
+        return ind
+    except Exception:
+        return None
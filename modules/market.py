@@ -5,42 +5,69 @@
 
 from __future__ import annotations
 import math
+import threading
 import time
-from functools import lru_cache
-from typing import Optional, Tuple
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+from urllib.parse import quote, urlparse
 
-import numpy as np
+from modules import metrics
+from modules.cache import NEGATIVE_TTL, NoStore, cached, ttl_for
 
-# ----- yfinance (있으면 우선 사용) -----
-try:
-    import yfinance as yf  # type: ignore
-    _YF = True
-except Exception:
-    yf = None  # type: ignore
-    _YF = False
+if TYPE_CHECKING:  # 무거운 의존성은 실제로 필요할 때 로드 (콜드스타트 단축)
+    import pandas as pd
 
-# ----- HTTP -----
-import requests
-from urllib.parse import quote
+# ----- yfinance (있으면 우선 사용, 첫 사용 시 로드) -----
+_yf_mod = None
+
+def load_yfinance():
+    """yfinance 모듈 (미설치/로드 실패 시 None). 최초 호출 때만 import."""
+    global _yf_mod
+    if _yf_mod is None:
+        try:
+            import yfinance  # type: ignore
+            _yf_mod = yfinance
+        except Exception:
+            _yf_mod = False
+    return _yf_mod or None
 
+# ----- HTTP -----
 _UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/124.0 Safari/537.36"
 )
 
-def _http_json(url: str, timeout: int = 6) -> dict:
-    r = requests.get(url, headers={"User-Agent": _UA}, timeout=timeout)
-    r.raise_for_status()
-    return r.json()
+# ----- 업스트림 호출 카운터 (CLI/배치 리포트용) -----
+UPSTREAM_CALLS: Counter = Counter()
+_calls_lock = threading.Lock()
+
+def _count_call(host: str) -> None:
+    with _calls_lock:
+        UPSTREAM_CALLS[host] += 1
+
+def _http_json(url: str, timeout: int = 6, provider: str = "yahoo") -> dict:
+    import requests
+    host = urlparse(url).netloc
+    _count_call(host)
+    try:
+        with metrics.timer("upstream_request_seconds", inflight="upstream_inflight", host=host, provider=provider):
+            r = requests.get(url, headers={"User-Agent": _UA}, timeout=timeout)
+            r.raise_for_status()
+            j = r.json()
+    except Exception:
+        metrics.inc("upstream_requests_total", host=host, provider=provider, outcome="error")
+        raise
+    metrics.inc("upstream_requests_total", host=host, provider=provider, outcome="ok")
+    return j
 
 # ----- Yahoo Quote API (정규장 기준 값) -----
-@lru_cache(maxsize=256)
 def _fetch_yahoo_quote_once(symbol: str) -> Tuple[Optional[float], Optional[float], Optional[int]]:
     enc = quote(symbol, safe="")
     url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={enc}"
     try:
-        j = _http_json(url)
+        j = _http_json(url, provider="yahoo_quote")
         res = (j.get("quoteResponse", {}) or {}).get("result", [])
         if not res:
             return None, None, None
@@ -55,12 +82,11 @@ def _fetch_yahoo_quote_once(symbol: str) -> Tuple[Optional[float], Optional[floa
         return None, None, None
 
 # ----- Yahoo Chart API (최후의 수단) -----
-@lru_cache(maxsize=256)
 def _fetch_yahoo_chart_once(symbol: str) -> Tuple[Optional[float], Optional[float], Optional[int]]:
     enc = quote(symbol, safe="")
     url = f"https://query1.finance.yahoo.com/v8/finance/chart/{enc}?range=5d&interval=1d&includePrePost=false"
     try:
-        j = _http_json(url)
+        j = _http_json(url, provider="yahoo_chart")
         res = j.get("chart", {}).get("result", [])
         if not res:
             return None, None, None
@@ -78,57 +104,75 @@ def _fetch_yahoo_chart_once(symbol: str) -> Tuple[Optional[float], Optional[floa
     except Exception:
         return None, None, None
 
-# ----- 짧은 TTL 메모리 캐시 -----
-_mem_cache: dict = {}
-def _memo(fn, symbol: str, ttl: float = 3.0):
-    now = time.time()
-    k = (fn.__name__, symbol)
-    v = _mem_cache.get(k)
-    if v and (now - v[0]) < ttl:
-        return v[1]
-    data = fn(symbol)
-    _mem_cache[k] = (now, data)
-    return data
-
 # ====== 외부에 노출되는 함수들 ======
+@cached("quotes")
 def fetch_quote(ticker: str) -> Tuple[Optional[float], Optional[float], Optional[int]]:
     """
-    (last, prev, volume) 반환
+    (last, prev, volume) 반환 - 결과는 공유 캐시 "quotes" 네임스페이스에 보관
     1) yfinance fast_info/history
     2) Yahoo Quote API (정규장 값) ← 정확도 우선
     3) Yahoo Chart API (최후의 수단)
     """
-    if _YF:
+    yf = load_yfinance()
+    if yf is not None:
         try:
-            t = yf.Ticker(ticker)
-            fi = getattr(t, "fast_info", None)
-            if fi:
-                last = getattr(fi, "last_price", None)
-                prev = getattr(fi, "previous_close", None)
-                vol  = getattr(fi, "last_volume", None)
-                if last and prev:
-                    return float(last), float(prev), (int(vol) if vol else None)
+            _count_call("yfinance")
+            with metrics.timer("upstream_request_seconds", inflight="upstream_inflight",
+                               host="yfinance", provider="yfinance_fast"):
+                t = yf.Ticker(ticker)
+                fi = getattr(t, "fast_info", None)
+                last = getattr(fi, "last_price", None) if fi else None
+                prev = getattr(fi, "previous_close", None) if fi else None
+                vol  = getattr(fi, "last_volume", None) if fi else None
+            if last and prev:
+                metrics.inc("quote_provider_total", provider="yfinance_fast", result="hit")
+                return float(last), float(prev), (int(vol) if vol else None)
         except Exception:
             pass
+        metrics.inc("quote_provider_total", provider="yfinance_fast", result="miss")
         try:
-            df = yf.Ticker(ticker).history(period="10d", interval="1d", auto_adjust=True)
+            _count_call("yfinance")
+            with metrics.timer("upstream_request_seconds", inflight="upstream_inflight",
+                               host="yfinance", provider="yfinance_history"):
+                df = yf.Ticker(ticker).history(period="10d", interval="1d", auto_adjust=True)
             if df is not None and not df.empty:
                 closes = df["Close"].dropna()
                 vols = df.get("Volume")
                 if len(closes) >= 2:
                     last = float(closes.iloc[-1]); prev = float(closes.iloc[-2])
                     vol = None
-                    if vols is not None and not np.isnan(vols.iloc[-1]):
+                    if vols is not None and not math.isnan(vols.iloc[-1]):
                         vol = int(vols.iloc[-1])
+                    metrics.inc("quote_provider_total", provider="yfinance_history", result="hit")
                     return last, prev, vol
         except Exception:
             pass
+        metrics.inc("quote_provider_total", provider="yfinance_history", result="miss")
 
-    q = _memo(_fetch_yahoo_quote_once, ticker)
+    q = _fetch_yahoo_quote_once(ticker)
     if q != (None, None, None):
+        metrics.inc("quote_provider_total", provider="yahoo_quote", result="hit")
         return q
+    metrics.inc("quote_provider_total", provider="yahoo_quote", result="miss")
 
-    return _memo(_fetch_yahoo_chart_once, ticker)
+    q = _fetch_yahoo_chart_once(ticker)
+    metrics.inc("quote_provider_total", provider="yahoo_chart", result="hit" if q != (None, None, None) else "miss")
+    return q
+
+def fetch_quotes(tickers: Iterable[str], workers: int = 8) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[int]]]:
+    """여러 티커를 (중복 제거 후) 병렬 조회 → {ticker: (last, prev, volume)}"""
+    uniq = list(dict.fromkeys(tickers))
+    if workers > 1 and len(uniq) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(uniq))) as ex:
+            return dict(zip(uniq, ex.map(fetch_quote, uniq)))
+    return {t: fetch_quote(t) for t in uniq}
+
+async def fetch_quotes_async(tickers: Iterable[str]) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[int]]]:
+    """asyncio 호출자용 fetch_quotes - 같은 티커 동시 요청은 스레드 호출자와도 1건으로 합쳐진다"""
+    import asyncio
+    uniq = list(dict.fromkeys(tickers))
+    return dict(zip(uniq, await asyncio.gather(*(fetch_quote.aio(t) for t in uniq))))
 
 def fmt_number(v, d: int = 2) -> str:
     try:
@@ -172,46 +216,90 @@ def build_ticker_items():
         })
     return items
 
-# ---- (선택) OHLC + 캔들차트 ----
-import pandas as pd
-import matplotlib.pyplot as plt
+# ---- 장 마감 (당일 일봉이 확정되는 시각) ----
+# 시장 → (시간대, 고정 오프셋(시간대 DB가 없을 때), 마감 시, 분). 정규장 마감 + 시세 지연 여유
+SESSION_CLOSE = {
+    "KR": ("Asia/Seoul", 9, 16, 0),          # 15:30 마감
+    "US": ("America/New_York", -5, 16, 30),  # 16:00 마감
+}
+
+def market_of(ticker: str) -> str:
+    """.KS/.KQ → "KR", 그 외 → "US" """
+    return "KR" if ticker.upper().endswith((".KS", ".KQ")) else "US"
 
+def _market_tz(market: str):
+    name, offset, _, _ = SESSION_CLOSE[market]
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        return timezone(timedelta(hours=offset))
+
+def _session_close(market: str, day: date) -> datetime:
+    _, _, hour, minute = SESSION_CLOSE[market]
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=_market_tz(market))
+
+def last_session(market: str = "KR", now: Optional[datetime] = None) -> date:
+    """마지막으로 마감된 거래일 (장 마감 전이면 전 거래일, 주말 → 직전 금요일, 공휴일은 구분하지 않음)"""
+    now = (now or datetime.now(timezone.utc)).astimezone(_market_tz(market))
+    d = now.date()
+    if now < _session_close(market, d):
+        d -= timedelta(days=1)
+    while d.weekday() >= 5:
+        d -= timedelta(days=1)
+    return d
+
+def session_open_seconds(market: str, day: date, now: Optional[datetime] = None) -> Optional[float]:
+    """day 봉이 아직 진행 중인 장이면 마감까지 남은 초, 아니면 None"""
+    now = (now or datetime.now(timezone.utc)).astimezone(_market_tz(market))
+    if day != now.date():
+        return None
+    left = (_session_close(market, day) - now).total_seconds()
+    return left if left > 0 else None
+
+# ---- (선택) OHLC ----
+def yf_download(*args, **kwargs) -> Optional[pd.DataFrame]:
+    """yfinance.download + 업스트림 메트릭 (호출 수 · 소요시간 · outcome). yfinance가 없으면 None, 요청 실패는 그대로 raise."""
+    yf = load_yfinance()
+    if yf is None:
+        return None
+    _count_call("yfinance")
+    try:
+        with metrics.timer("upstream_request_seconds", inflight="upstream_inflight",
+                           host="yfinance", provider="yfinance_download"):
+            df = yf.download(*args, **kwargs)
+    except Exception:
+        metrics.inc("upstream_requests_total", host="yfinance", provider="yfinance_download", outcome="error")
+        raise
+    empty = df is None or df.empty
+    metrics.inc("upstream_requests_total", host="yfinance", provider="yfinance_download",
+                outcome="empty" if empty else "ok")
+    return df
+
+@cached("ohlc")
 def get_ohlc(ticker: str, days: int = 120) -> pd.DataFrame:
-    if not _YF:
-        return pd.DataFrame()
+    """
+    일봉 OHLCV (최근 days행). 실패/빈 응답은 빈 DataFrame - NEGATIVE_TTL 동안만 캐시하고 그 뒤 다시 시도.
+    마지막 봉이 진행 중인 장이면 마감 시각까지만 캐시 (마감 뒤 확정 봉을 다시 받음).
+    """
+    import pandas as pd
     period_map = 365 if days > 252 else max(30, days + 10)
     try:
-        df = yf.download(ticker, period=f"{period_map}d", interval="1d", auto_adjust=False, progress=False)
+        df = yf_download(ticker, period=f"{period_map}d", interval="1d", auto_adjust=False, progress=False)
     except Exception:
-        return pd.DataFrame()
+        df = None
     if df is None or df.empty:
-        return pd.DataFrame()
+        return NoStore(pd.DataFrame(), ttl=NEGATIVE_TTL)  # type: ignore[return-value]
     df = df[~df.index.duplicated(keep="last")].dropna(subset=["Open","High","Low","Close"])
-    return df[["Open","High","Low","Close","Volume"]].tail(days).copy()
+    df = df[["Open","High","Low","Close","Volume"]].tail(days).copy()
+    left = session_open_seconds(market_of(ticker), df.index[-1].date()) if len(df) else None
+    if left is not None:
+        return NoStore(df, ttl=min(ttl_for("ohlc"), left))  # type: ignore[return-value]
+    return df
 
-def plot_candles(df: pd.DataFrame, title: str = "", lookback: int = 60):
-    if df is None or df.empty:
-        fig, ax = plt.subplots(figsize=(8, 3))
-        ax.text(0.5, 0.5, "차트 데이터 없음", ha="center", va="center")
-        ax.axis("off")
-        return fig
-    data = df.tail(max(20, lookback)).copy()
-    x = np.arange(len(data))
-    o, h, l, c = data["Open"].values, data["High"].values, data["Low"].values, data["Close"].values
-    fig, ax = plt.subplots(figsize=(8, 3))
-    width = 0.6
-    for i in range(len(data)):
-        color = "#d93025" if c[i] >= o[i] else "#1a73e8"
-        ax.vlines(x=i, ymin=l[i], ymax=h[i], colors=color, linewidth=1)
-        top, bottom = max(o[i], c[i]), min(o[i], c[i])
-        height = max(top - bottom, 1e-6)
-        ax.add_patch(plt.Rectangle((i - width/2, bottom), width, height, color=color, alpha=0.8, linewidth=0))
-    ax.set_xlim(-1, len(data))
-    ax.set_title(title or "일봉 차트", fontsize=11)
-    ax.grid(True, linestyle="--", alpha=0.25)
-    step = max(1, len(data)//6)
-    ax.set_xticks(x[::step])
-    ax.set_xticklabels([data.index[i].strftime("%m-%d") for i in x[::step]])
-    ax.tick_params(axis='x', labelsize=9); ax.tick_params(axis='y', labelsize=9)
-    fig.tight_layout()
-    return fig
+def __getattr__(name: str):
+    # 하위호환: market.plot_candles → modules.chart (matplotlib은 이때 로드)
+    if name == "plot_candles":
+        from modules.chart import plot_candles
+        return plot_candles
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
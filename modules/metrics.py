@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# modules/metrics.py
+# 경량 메트릭/트레이싱 (카운터 · 게이지 · 히스토그램 → Prometheus 텍스트)
+#
+# 기본은 꺼져 있음: NEWS_METRICS=1 또는 enable() 로 켠다.
+# 꺼져 있으면 모든 기록 함수가 플래그 확인 후 바로 반환 (오버헤드 ≈ 함수 호출 1회).
+
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_enabled = os.environ.get("NEWS_METRICS", "").lower() not in ("", "0", "false", "no")
+_lock = threading.Lock()
+
+# 지연시간 기본 버킷 (초)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP: Dict[str, str] = {
+    "upstream_request_seconds": "업스트림 요청 지연시간 (host/provider별)",
+    "upstream_requests_total": "업스트림 요청 수 (outcome=ok|empty|error)",
+    "upstream_retries_total": "업스트림 재시도 수",
+    "upstream_inflight": "진행 중인 업스트림 요청 수",
+    "quote_provider_total": "시세 provider 결과 (result=hit|miss) - 폴백 경로 가시화",
+    "cache_requests_total": "캐시 조회 수 (result=hit|miss)",
+    "cache_evictions_total": "캐시 만료/퇴출 수",
+    "singleflight_calls_total": "동시 요청 합치기 (role=leader: 실제 실행, follower: 진행 중 결과 공유)",
+    "singleflight_timeouts_total": "진행 중 요청 대기 시간 초과 수",
+    "pipeline_stage_seconds": "파이프라인 단계별 소요시간 (fetch/parse/detect/quotes/score/export)",
+}
+
+_counters: Dict[Tuple[str, LabelKey], float] = {}
+_gauges: Dict[Tuple[str, LabelKey], float] = {}
+_hists: Dict[Tuple[str, LabelKey], List[float]] = {}  # [bucket counts..., +Inf, sum]
+_generation = 0  # reset()마다 증가 - 그 이전에 올린 in-flight 게이지는 내리지 않음
+
+
+def enable(on: bool = True) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+def is_enabled() -> bool:
+    return _enabled
+
+def reset() -> None:
+    global _generation
+    with _lock:
+        _counters.clear(); _gauges.clear(); _hists.clear()
+        _generation += 1
+
+
+def _key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ----- 기록 API -----
+def inc(name: str, n: float = 1.0, **labels) -> None:
+    if not _enabled:
+        return
+    k = (name, _key(labels))
+    with _lock:
+        _counters[k] = _counters.get(k, 0.0) + n
+
+def gauge_add(name: str, delta: float, **labels) -> None:
+    if not _enabled:
+        return
+    k = (name, _key(labels))
+    with _lock:
+        _gauges[k] = _gauges.get(k, 0.0) + delta
+
+def observe(name: str, value: float, **labels) -> None:
+    if not _enabled:
+        return
+    k = (name, _key(labels))
+    with _lock:
+        h = _hists.get(k)
+        if h is None:
+            h = _hists[k] = [0.0] * (len(DEFAULT_BUCKETS) + 2)
+        for i, b in enumerate(DEFAULT_BUCKETS):
+            if value <= b:
+                h[i] += 1
+                break
+        else:
+            h[len(DEFAULT_BUCKETS)] += 1
+        h[-1] += value
+
+
+class _Noop:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NOOP = _Noop()
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "inflight", "t0", "_gauge")
+
+    def __init__(self, name: str, labels: Dict[str, object], inflight: Optional[str]):
+        self.name, self.labels, self.inflight = name, labels, inflight
+        self._gauge = None  # 올린 in-flight 게이지 (키, reset 세대)
+
+    def __enter__(self):
+        if self.inflight and _enabled:
+            k = (self.inflight, _key(self.labels))
+            with _lock:
+                _gauges[k] = _gauges.get(k, 0.0) + 1
+                self._gauge = (k, _generation)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.t0, **self.labels)
+        if self._gauge is not None:
+            # 도중에 메트릭을 꺼도 올린 만큼은 반드시 내린다 (gauge_add는 꺼져 있으면 무시)
+            k, gen = self._gauge
+            with _lock:
+                if gen == _generation:
+                    _gauges[k] = _gauges.get(k, 0.0) - 1
+            self._gauge = None
+        return False
+
+
+def timer(name: str, inflight: Optional[str] = None, **labels):
+    """with timer("upstream_request_seconds", inflight="upstream_inflight", host=...): ..."""
+    if not _enabled:
+        return _NOOP
+    return _Timer(name, labels, inflight)
+
+
+# ----- 조회/출력 -----
+def snapshot() -> List[Dict[str, object]]:
+    """관리 패널용 평탄화 목록 [{metric, labels, type, value, count?}]"""
+    rows: List[Dict[str, object]] = []
+    with _lock:
+        for (name, lk), v in sorted(_counters.items()):
+            rows.append({"metric": name, "labels": dict(lk), "type": "counter", "value": v})
+        for (name, lk), v in sorted(_gauges.items()):
+            rows.append({"metric": name, "labels": dict(lk), "type": "gauge", "value": v})
+        for (name, lk), h in sorted(_hists.items()):
+            cnt = sum(h[:-1])
+            rows.append({"metric": name, "labels": dict(lk), "type": "histogram",
+                         "value": (h[-1] / cnt) if cnt else 0.0, "count": int(cnt), "sum": h[-1]})
+    return rows
+
+
+def _fmt_labels(lk: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = list(lk) + list(extra)
+    if not items:
+        return ""
+    esc = lambda s: s.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    out: List[str] = []
+    with _lock:
+        counters, gauges, hists = dict(_counters), dict(_gauges), {k: list(v) for k, v in _hists.items()}
+
+    def _header(name: str, kind: str, seen: set):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in HELP:
+            out.append(f"# HELP {name} {HELP[name]}")
+        out.append(f"# TYPE {name} {kind}")
+
+    seen: set = set()
+    for (name, lk), v in sorted(counters.items()):
+        _header(name, "counter", seen)
+        out.append(f"{name}{_fmt_labels(lk)} {v:g}")
+    for (name, lk), v in sorted(gauges.items()):
+        _header(name, "gauge", seen)
+        out.append(f"{name}{_fmt_labels(lk)} {v:g}")
+    for (name, lk), h in sorted(hists.items()):
+        _header(name, "histogram", seen)
+        acc = 0.0
+        for b, c in zip(DEFAULT_BUCKETS, h):
+            acc += c
+            out.append(f"{name}_bucket{_fmt_labels(lk, (('le', f'{b:g}'),))} {acc:g}")
+        acc += h[len(DEFAULT_BUCKETS)]
+        out.append(f"{name}_bucket{_fmt_labels(lk, (('le', '+Inf'),))} {acc:g}")
+        out.append(f"{name}_sum{_fmt_labels(lk)} {h[-1]:.6f}")
+        out.append(f"{name}_count{_fmt_labels(lk)} {acc:g}")
+    return "\n".join(out) + "\n"
+
+
+# ----- 로컬 /metrics 엔드포인트 -----
+_server = None
+_server_lock = threading.Lock()
+
+def serve(port: int = 9108, host: str = "127.0.0.1"):
+    """백그라운드 스레드로 GET /metrics 제공 (이미 떠 있으면 재사용). 메트릭 수집도 켠다."""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # 접근 로그 생략
+                pass
+
+        enable(True)
+        _server = ThreadingHTTPServer((host, int(port)), _Handler)
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
+
+
+def write_textfile(path: str) -> None:
+    """node_exporter textfile collector 등을 위한 원자적 파일 출력"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
@@ -2,13 +2,16 @@
 from __future__ import annotations
 from typing import List, Dict, Any
 from datetime import datetime, timedelta, timezone
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
+from collections import Counter
+import threading
 import time
 from email.utils import parsedate_to_datetime
 
-import requests
-import feedparser
-from bs4 import BeautifulSoup
+from modules import metrics
+from modules.cache import cached
+
+# requests / feedparser / bs4 는 실제 수집 시점에 로드 (콜드스타트 단축)
 
 KST = timezone(timedelta(hours=9))
 
@@ -65,24 +68,44 @@ def _parse_dt(s: str):
     except Exception:
         return None
 
+# ----- 업스트림 호출 카운터 (CLI/배치 리포트용) -----
+UPSTREAM_CALLS: Counter = Counter()
+_calls_lock = threading.Lock()
+
+def _count_call(url: str) -> None:
+    with _calls_lock:
+        UPSTREAM_CALLS[urlparse(url).netloc] += 1
+
 def _http_get(url: str, timeout: int = 8, retries: int = 1) -> str:
     ua = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
           "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+    import requests
+    host = urlparse(url).netloc
     last_err = None
     for i in range(retries+1):
+        if i:
+            metrics.inc("upstream_retries_total", host=host)
         try:
-            r = requests.get(url, headers={"User-Agent": ua}, timeout=timeout)
+            _count_call(url)
+            with metrics.timer("upstream_request_seconds", inflight="upstream_inflight",
+                               host=host, provider="google_news"):
+                r = requests.get(url, headers={"User-Agent": ua}, timeout=timeout)
             if r.status_code == 200 and r.text:
+                metrics.inc("upstream_requests_total", host=host, provider="google_news", outcome="ok")
                 return r.text
+            metrics.inc("upstream_requests_total", host=host, provider="google_news", outcome="empty")
         except Exception as e:
+            metrics.inc("upstream_requests_total", host=host, provider="google_news", outcome="error")
             last_err = e; time.sleep(0.25*(i+1))
     if last_err:
         raise last_err
     return ""
 
+# NewsBatch(numpy)는 수집/감지 시점에 로드 (콜드스타트 단축)
 def _parse_entries(feed, days: int):
+    from modules.newsbatch import NewsBatch, NO_TIME
     now = datetime.now(KST)
-    out = []
+    titles, links, descs, times = [], [], [], []
     for e in feed.entries:
         t = None
         if getattr(e, "published", None):
@@ -91,55 +114,73 @@ def _parse_entries(feed, days: int):
             t = _parse_dt(getattr(e, "updated"))
         if t and (now - t) > timedelta(days=days):
             continue
-        title = (getattr(e, "title", "") or "").strip()
         link = (getattr(e, "link", "") or "").strip()
         if link.startswith("./"):
             link = "https://news.google.com/" + link[2:]
-        desc = _clean_html(getattr(e, "summary", ""))
-        out.append({"title": title, "link": link, "time": t.strftime("%Y-%m-%d %H:%M") if t else "-", "desc": desc})
-    return out
+        titles.append((getattr(e, "title", "") or "").strip())
+        links.append(link)
+        descs.append(_clean_html(getattr(e, "summary", "")))
+        times.append(int(t.timestamp()) if t else NO_TIME)
+    return NewsBatch.from_columns(titles, links, descs, times)
 
+@cached("news")
 def fetch_google_news_by_keyword(keyword: str, days: int = 3, limit: int = 40):
     url = f"https://news.google.com/rss/search?q={quote_plus(keyword)}&hl=ko&gl=KR&ceid=KR%3Ako"
+    import feedparser
     xml = _http_get(url, timeout=8, retries=1)
-    feed = feedparser.parse(xml)
-    return _parse_entries(feed, days)[:max(1, int(limit))]
+    with metrics.timer("pipeline_stage_seconds", stage="parse"):
+        feed = feedparser.parse(xml)
+        items = _parse_entries(feed, days)
+    return items[:max(1, int(limit))]
 
-def fetch_category_news(cat: str, days: int = 3, max_items: int = 100):
-    seen, merged = set(), []
-    for kw in CATEGORIES.get(cat, []):
-        try:
-            for it in fetch_google_news_by_keyword(kw, days=days, limit=40):
-                key = (it.get("title",""), it.get("link",""))
-                if key in seen: continue
-                seen.add(key); merged.append(it)
-        except Exception:
-            continue
-    def _key(x):
-        try:
-            return datetime.strptime(x["time"], "%Y-%m-%d %H:%M")
-        except Exception:
-            return datetime.min.replace(tzinfo=None)
-    merged.sort(key=_key, reverse=True)
-    return merged[:max(1, int(max_items))]
+def _fetch_keyword_safe(kw: str, days: int):
+    from modules.newsbatch import NewsBatch
+    try:
+        return fetch_google_news_by_keyword(kw, days=days, limit=40)
+    except Exception:
+        return NewsBatch.empty()
+
+def fetch_category_news(cat: str, days: int = 3, max_items: int = 100, workers: int = 1):
+    from modules.newsbatch import NewsBatch
+    kws = CATEGORIES.get(cat, [])
+    if workers > 1 and len(kws) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(kws))) as ex:
+            results = list(ex.map(lambda kw: _fetch_keyword_safe(kw, days), kws))
+    else:
+        results = [_fetch_keyword_safe(kw, days) for kw in kws]
+    # 키워드 순서대로 이어 붙인 뒤 중복 제거 → 순차 실행과 같은 결과, 최신순 (시간 없는 기사는 뒤)
+    merged = NewsBatch.concat(results).dedupe().sort_by_time(descending=True)
+    return merged[:max(1, int(max_items))].with_category(cat)
 
-def fetch_all_news(days: int = 3, per_cat: int = 100):
-    all_news = []
+def fetch_all_news(days: int = 3, per_cat: int = 100, workers: int = 1):
+    from modules.newsbatch import NewsBatch
+    parts = []
     for c in CATEGORIES.keys():
         try:
-            all_news.extend(fetch_category_news(c, days=days, max_items=per_cat))
+            parts.append(fetch_category_news(c, days=days, max_items=per_cat, workers=workers))
         except Exception:
             continue
-    return all_news
+    return NewsBatch.concat(parts)
 
-def detect_themes(news_list):
+def detect_themes(news_list, index=None):
+    """
+    NewsBatch 또는 기사 dict 목록 → [{"theme","count","sample_link"}] (건수 내림차순)
+    index(NewsIndex)를 넘기면 같은 매칭 결과로 역색인도 증분 갱신한다.
+    """
+    from modules.newsbatch import NewsBatch
+    batch = NewsBatch.from_records(news_list if news_list is not None else [])
     result, sample_link = {}, {}
-    for n in news_list or []:
-        text = f"{n.get('title','')} {n.get('desc','')}".lower()
-        for theme, kws in THEME_KEYWORDS.items():
-            if any(k in text for k in kws):
-                result[theme] = result.get(theme, 0) + 1
-                sample_link.setdefault(theme, n.get("link",""))
+    matched = [] if index is not None else None
+    for text, link in zip(batch.texts(), batch.column("link")):
+        hits = [theme for theme, kws in THEME_KEYWORDS.items() if any(k in text for k in kws)]
+        for theme in hits:
+            result[theme] = result.get(theme, 0) + 1
+            sample_link.setdefault(theme, link)
+        if matched is not None:
+            matched.append(hits)
+    if index is not None:
+        index.add(batch, matched=matched)
     rows = [{"theme": t, "count": c, "sample_link": sample_link.get(t,"")} for t, c in result.items() if c > 0]
     rows.sort(key=lambda x: x["count"], reverse=True)
     return rows
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# modules/news_index.py
+# 테마/키워드 → 기사 역색인 (드릴다운 · 테마별 요약을 전체 재탐색 없이 제공)
+#
+#   idx = NewsIndex()
+#   detect_themes(batch, index=idx)              # 테마 감지하면서 색인 갱신 (중복 기사는 건너뜀)
+#   idx.search("반도체 AND 수출", since=now - timedelta(hours=24), k=20)   # 최신순 top-k NewsBatch
+#
+# - 기사 id는 추가 순서대로 0,1,2,... → posting list는 항상 오름차순 (교집합은 정렬 배열 연산)
+# - 테마 이름은 테마 posting, 그 외 단어는 토큰 posting (한국어 조사 대응: "수출" → 수출, 수출이, 수출액 ...)
+
+from __future__ import annotations
+import bisect
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from modules.newsbatch import NO_TIME, NewsBatch
+
+_TOKEN_RE = re.compile(r"[^가-힣A-Za-z0-9\s]")
+_SPLIT_RE = re.compile(r"\s+(?:AND|&)\s+|\s+", re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """extract_keywords와 같은 규칙 (한글/영문/숫자, 2자 이상) + 소문자"""
+    return [w for w in _TOKEN_RE.sub(" ", (text or "").lower()).split() if len(w) >= 2]
+
+
+class _IntArray:
+    """
+    append-only int64 배열. append는 리스트에 쌓고, array()가 새로 쌓인 꼬리만 버퍼(용량 2배씩 증가)로 옮긴 뒤
+    복사 없는 view를 준다 → 기사를 추가해도 조회 때 전체 리스트 → 배열 변환을 다시 하지 않는다 (posting list · 발행시각 공용).
+    """
+    __slots__ = ("_buf", "_n", "_tail")
+
+    def __init__(self, capacity: int = 8):
+        self._buf = np.empty(capacity, dtype=np.int64)
+        self._n = 0
+        self._tail: List[int] = []
+
+    def __len__(self) -> int:
+        return self._n + len(self._tail)
+
+    def append(self, v: int) -> None:
+        self._tail.append(v)
+
+    def array(self) -> np.ndarray:
+        if self._tail:
+            n, k = self._n, len(self._tail)
+            if n + k > len(self._buf):
+                buf = np.empty(max(2 * len(self._buf), n + k), dtype=np.int64)  # 이전 버퍼의 view는 그대로 유효
+                buf[:n] = self._buf[:n]
+                self._buf = buf
+            self._buf[n:n + k] = self._tail
+            self._n, self._tail = n + k, []
+        return self._buf[:self._n]
+
+
+class NewsIndex:
+    def __init__(self, theme_keywords: Optional[Dict[str, List[str]]] = None, max_articles: int = 200_000):
+        if theme_keywords is None:
+            from modules.news import THEME_KEYWORDS
+            theme_keywords = THEME_KEYWORDS
+        self.theme_keywords = theme_keywords  # detect_themes와 같은 규칙 (소문자 텍스트에 부분 문자열)
+        self.max_articles = max_articles
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.version = 0
+        self._title: List[str] = []
+        self._link: List[str] = []
+        self._desc: List[str] = []
+        self._ts = _IntArray(1024)  # 기사 id → 발행시각 (epoch 초, NO_TIME=없음)
+        self._ids: Dict[tuple, int] = {}  # (title, link) → id
+        self.themes: Dict[str, _IntArray] = {}
+        self.tokens: Dict[str, _IntArray] = {}
+        self._vocab: List[str] = []       # 정렬된 토큰 목록 (접두어 조회용) - add()가 끝날 때 새 토큰만 병합
+        self._new_tokens: List[str] = []
+        self._memo: Dict[tuple, object] = {}  # (version, ...) → 결과
+
+    # ----- 색인 -----
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def match_themes(self, text: str) -> List[str]:
+        return [t for t, kws in self.theme_keywords.items() if any(k in text for k in kws)]
+
+    def add(self, news, matched: Optional[Sequence[List[str]]] = None) -> np.ndarray:
+        """
+        기사 추가 → 각 기사의 id 배열 (이미 있던 기사는 기존 id).
+        matched: 기사별 테마 목록을 이미 계산했다면 전달 (detect_themes에서 재사용).
+        """
+        batch = NewsBatch.from_records(news)
+        titles, links, descs = batch.column("title"), batch.column("link"), batch.column("desc")
+        ts = batch.ts.tolist()
+        with self._lock:
+            if len(self) + len(batch) > self.max_articles:
+                self._compact(keep=self.max_articles // 2)
+            out = np.empty(len(batch), dtype=np.int64)
+            for j, (title, link, desc) in enumerate(zip(titles, links, descs)):
+                key = (title, link)
+                aid = self._ids.get(key)
+                if aid is None:
+                    aid = self._append(title, link, desc, ts[j],
+                                       matched[j] if matched is not None else None)
+                out[j] = aid
+            self._merge_vocab()
+            return out
+
+    def _append(self, title: str, link: str, desc: str, ts: int, themes: Optional[List[str]]) -> int:
+        aid = len(self._ts)
+        self._ids[(title, link)] = aid
+        self._title.append(title); self._link.append(link); self._desc.append(desc)
+        self._ts.append(int(ts))
+        text = f"{title} {desc}".lower()
+        for t in (themes if themes is not None else self.match_themes(text)):
+            self.themes.setdefault(t, _IntArray()).append(aid)
+        for w in set(tokenize(text)):
+            p = self.tokens.get(w)
+            if p is None:
+                p = self.tokens[w] = _IntArray()
+                self._new_tokens.append(w)
+            p.append(aid)
+        self.version += 1
+        return aid
+
+    def _compact(self, keep: int) -> None:
+        """가장 최근 keep건만 남기고 재색인 (메모리 상한)"""
+        ts = self._ts.array()
+        order = np.argsort(ts, kind="stable")[-keep:]
+        order.sort()
+        rows = [(self._title[i], self._link[i], self._desc[i], int(ts[i])) for i in order.tolist()]
+        self._reset()
+        for title, link, desc, ts in rows:
+            self._append(title, link, desc, ts, None)
+        self._merge_vocab()
+
+    def _merge_vocab(self) -> None:
+        """새 토큰을 정렬 상태로 끼워 넣기 (조회 때 전체 재정렬하지 않음)"""
+        new, self._new_tokens = self._new_tokens, []
+        if len(new) <= 64:
+            for w in new:
+                bisect.insort(self._vocab, w)
+        elif new:
+            self._vocab.extend(sorted(new))
+            self._vocab.sort()  # 정렬된 두 구간 → timsort가 선형 병합
+
+    # ----- 조회 -----
+    def _ts_array(self) -> np.ndarray:
+        return self._ts.array()
+
+    def postings(self, term: str) -> np.ndarray:
+        """테마 이름 → 테마 posting, 그 외 → 해당 단어로 시작하는 토큰들의 합집합"""
+        if term in self.theme_keywords:
+            p = self.themes.get(term)
+            return p.array() if p is not None else np.empty(0, dtype=np.int64)
+        w = term.lower()
+        key = (self.version, "term", w)
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit  # type: ignore[return-value]
+        lo = bisect.bisect_left(self._vocab, w)
+        hi = bisect.bisect_left(self._vocab, w + "￿")
+        lists = [self.tokens[v].array() for v in self._vocab[lo:hi]]
+        if not lists:
+            arr = np.empty(0, dtype=np.int64)
+        elif len(lists) == 1:
+            arr = lists[0]
+        else:
+            arr = np.unique(np.concatenate(lists))
+        self._memo[key] = arr
+        self._prune_memo()
+        return arr
+
+    def ids(self, all_of: Iterable[str] = (), since: Optional[datetime] = None,
+            until: Optional[datetime] = None) -> np.ndarray:
+        """모든 term을 포함하는 기사 id (오름차순). term이 없으면 전체."""
+        with self._lock:
+            ids = self._match(tuple(sorted({t for t in all_of if t})))
+            if since is not None or until is not None:
+                ts = self._ts_array()[ids]
+                mask = np.ones(len(ids), dtype=bool)
+                if since is not None:
+                    mask &= ts >= int(since.timestamp())
+                if until is not None:
+                    mask &= (ts < int(until.timestamp())) & (ts != NO_TIME)
+                ids = ids[mask]
+            return ids
+
+    def _match(self, terms: tuple) -> np.ndarray:
+        if not terms:
+            return np.arange(len(self), dtype=np.int64)
+        if len(terms) == 1:
+            return self.postings(terms[0])
+        key = (self.version, "and", terms)
+        hit = self._memo.get(key)
+        if hit is None:
+            lists = sorted((self.postings(t) for t in terms), key=len)
+            hit = lists[0]
+            for p in lists[1:]:
+                if not len(hit):
+                    break
+                hit = _intersect(hit, p, len(self))
+            self._memo[key] = hit
+            self._prune_memo()
+        return hit  # type: ignore[return-value]
+
+    def top_k(self, ids: np.ndarray, k: int = 20) -> np.ndarray:
+        """ids 중 최신순 k개 (시간 없는 기사는 뒤, 동시간대는 나중에 색인된 기사 우선)"""
+        if not len(ids):
+            return ids
+        ts = self._ts_array()[ids]
+        # 오름차순 키 (작을수록 최신). 부호 반전은 ts에만 → NO_TIME 센티널이 오버플로하지 않음
+        key = np.where(ts == NO_TIME, np.iinfo(np.int64).max, -ts)
+        if len(ids) > k:
+            # k번째 키보다 확실히 앞선 것 + 경계 동률 중 id가 큰 것 (argpartition은 동률 순서를 보장하지 않음)
+            kth = np.partition(key, k - 1)[k - 1]
+            head = key < kth
+            tie = np.flatnonzero(key == kth)
+            tie = tie[np.argsort(-ids[tie], kind="stable")[:k - int(head.sum())]]
+            keep = np.concatenate([np.flatnonzero(head), tie])
+            ids, key = ids[keep], key[keep]
+        order = np.lexsort((-ids, key))
+        return ids[order]
+
+    def batch(self, ids: Sequence[int]) -> NewsBatch:
+        ids = list(map(int, ids))
+        return NewsBatch.from_columns(
+            [self._title[i] for i in ids], [self._link[i] for i in ids],
+            [self._desc[i] for i in ids], self._ts_array()[ids].tolist(),
+        )
+
+    def search(self, query, since: Optional[datetime] = None, until: Optional[datetime] = None,
+               k: int = 20) -> NewsBatch:
+        """'반도체 AND 수출' 또는 ["반도체", "수출"] → 최신순 top-k 기사"""
+        terms = parse_query(query) if isinstance(query, str) else list(query)
+        with self._lock:
+            return self.batch(self.top_k(self.ids(terms, since=since, until=until), k))
+
+    def count(self, query, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        terms = parse_query(query) if isinstance(query, str) else list(query)
+        return int(len(self.ids(terms, since=since, until=until)))
+
+    def theme_summary(self, theme: str, n_sent: int = 3, k: int = 50) -> List[str]:
+        """테마 최신 기사 k건 설명으로 요약 문장 (색인 버전이 같으면 캐시)"""
+        key = (self.version, "summary", theme, n_sent, k)
+        with self._lock:
+            hit = self._memo.get(key)
+            if hit is None:
+                from modules.ai_logic import summarize_sentences
+                top = self.top_k(self.ids([theme]), k)
+                hit = self._memo[key] = summarize_sentences([self._desc[i] for i in top.tolist()], n_sent=n_sent)
+                self._prune_memo()
+            return list(hit)  # type: ignore[arg-type]
+
+    def _prune_memo(self) -> None:
+        if len(self._memo) > 1024:
+            self._memo = {k: v for k, v in self._memo.items() if k[0] == self.version}
+
+
+def _intersect(small: np.ndarray, big: np.ndarray, n: int) -> np.ndarray:
+    """정렬된 id 배열 교집합: 큰 쪽을 길이 n 비트맵으로 찍고 작은 쪽을 조회 (O(s + b), 순서 유지)"""
+    if not len(small) or not len(big):
+        return small[:0]
+    mask = np.zeros(n, dtype=bool)
+    mask[big] = True
+    return small[mask[small]]
+
+
+def parse_query(q: str) -> List[str]:
+    """'반도체 AND 수출', '반도체 & 수출', '반도체 수출' → ["반도체", "수출"] (모두 AND)"""
+    return [t for t in _SPLIT_RE.split((q or "").strip()) if t]
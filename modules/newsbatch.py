@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# modules/newsbatch.py
+# 뉴스 컬럼형 컨테이너 (NewsBatch)
+#
+# - 문자열 컬럼: numpy object 배열 또는 pyarrow Array (둘 다 슬라이스가 zero-copy)
+# - 시간: epoch 초 int64 (-1 = 시간 없음), 언론사/카테고리: 정수 코드 + 인터닝된 이름 튜플
+# - 행 단위로 순회/인덱싱하면 기존과 같은 dict({"title","link","time","desc",...})를 돌려주므로
+#   n.get("title") 식의 기존 코드가 그대로 동작한다.
+# - pickle/캐시 직렬화 시 문자열 컬럼을 문자열 1개로 묶어 기사 수만큼의 pickle 객체를 만들지 않는다.
+
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+KST = timezone(timedelta(hours=9))
+TIME_FMT = "%Y-%m-%d %H:%M"
+NO_TIME = -1
+
+STR_COLUMNS = ("title", "link", "desc")
+
+
+# ----- 문자열 컬럼 헬퍼 (numpy object / pyarrow 공통) -----
+def _is_arrow(col) -> bool:
+    return not isinstance(col, np.ndarray)
+
+def _str_col(values: Iterable[str]) -> np.ndarray:
+    vals = list(values)
+    arr = np.empty(len(vals), dtype=object)
+    arr[:] = vals
+    return arr
+
+def _take(col, idx: np.ndarray):
+    if _is_arrow(col):
+        return col.take(idx)
+    return col[idx]
+
+def _to_list(col) -> List[str]:
+    return col.to_pylist() if _is_arrow(col) else col.tolist()
+
+_SEP = "\x00"
+
+def _pack(col) -> Tuple[str, Any]:
+    """문자열 컬럼 → 직렬화 형태. 보통은 NUL로 이은 문자열 1개(join/split 모두 C 속도),
+    값에 NUL이 있으면 UTF-8 버퍼 + int64 오프셋"""
+    vals = _to_list(col)
+    joined = _SEP.join(vals)
+    if joined.count(_SEP) == max(0, len(vals) - 1):
+        return "sep", (joined, len(vals))
+    enc = [v.encode("utf-8") for v in vals]
+    offsets = np.zeros(len(enc) + 1, dtype=np.int64)
+    if enc:
+        np.cumsum([len(b) for b in enc], out=offsets[1:])
+    return "off", (b"".join(enc), offsets)
+
+def _unpack(kind: str, payload) -> np.ndarray:
+    if kind == "sep":
+        joined, n = payload
+        return _str_col(joined.split(_SEP) if n else [])
+    buf, offsets = payload
+    mv = memoryview(buf)
+    o = offsets.tolist()
+    return _str_col(str(mv[o[i]:o[i + 1]], "utf-8") for i in range(len(o) - 1))
+
+
+def _intern(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """문자열 목록 → (int32 코드, 이름 튜플). None/빈 값은 -1"""
+    table: Dict[str, int] = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        if not v:
+            codes[i] = -1
+            continue
+        c = table.get(v)
+        if c is None:
+            c = table[v] = len(table)
+        codes[i] = c
+    return codes, tuple(table)
+
+
+def source_of(title: str) -> str:
+    """Google News 제목 끝의 ' - 언론사' 추출"""
+    head, sep, tail = (title or "").rpartition(" - ")
+    return tail.strip() if sep and head else ""
+
+
+def parse_time(s: Optional[str]) -> int:
+    """'YYYY-MM-DD HH:MM'(KST) → epoch 초, 실패 시 NO_TIME"""
+    try:
+        return int(datetime.strptime(s or "", TIME_FMT).replace(tzinfo=KST).timestamp())
+    except ValueError:
+        return NO_TIME
+
+
+def format_time(ts: int) -> str:
+    return datetime.fromtimestamp(int(ts), KST).strftime(TIME_FMT) if ts != NO_TIME else "-"
+
+
+class NewsBatch:
+    """기사 묶음 (컬럼형). 길이·컬럼 길이는 항상 같다."""
+
+    __slots__ = ("title", "link", "desc", "ts", "source", "category", "sources", "categories")
+
+    def __init__(self, title, link, desc, ts: np.ndarray,
+                 source: Optional[np.ndarray] = None, category: Optional[np.ndarray] = None,
+                 sources: Tuple[str, ...] = (), categories: Tuple[str, ...] = ()):
+        n = len(ts)
+        self.title, self.link, self.desc = title, link, desc
+        self.ts = np.asarray(ts, dtype=np.int64)
+        self.source = source if source is not None else np.full(n, -1, dtype=np.int32)
+        self.category = category if category is not None else np.full(n, -1, dtype=np.int16)
+        self.sources, self.categories = tuple(sources), tuple(categories)
+
+    # ----- 생성 -----
+    @classmethod
+    def empty(cls) -> "NewsBatch":
+        return cls(_str_col([]), _str_col([]), _str_col([]), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_columns(cls, title: Sequence[str], link: Sequence[str], desc: Sequence[str], ts: Sequence[int],
+                     category: Optional[str] = None) -> "NewsBatch":
+        src_codes, sources = _intern([source_of(t) for t in title])
+        n = len(ts)
+        cats: Tuple[str, ...] = (category,) if category else ()
+        cat_codes = np.full(n, 0 if category else -1, dtype=np.int16)
+        return cls(_str_col(title), _str_col(link), _str_col(desc), np.asarray(ts, dtype=np.int64),
+                   src_codes, cat_codes, sources, cats)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], category: Optional[str] = None) -> "NewsBatch":
+        """기존 dict 목록(title/link/time/desc) → NewsBatch"""
+        if isinstance(records, NewsBatch):
+            return records
+        recs = list(records or [])
+        return cls.from_columns(
+            [r.get("title", "") or "" for r in recs],
+            [r.get("link", "") or "" for r in recs],
+            [r.get("desc", "") or "" for r in recs],
+            [parse_time(r.get("time")) for r in recs],
+            category=category,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["NewsBatch"]) -> "NewsBatch":
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+
+        def _remap(attr_codes: str, attr_names: str, dtype):
+            names: Dict[str, int] = {}
+            parts = []
+            for b in batches:
+                lut = np.array([names.setdefault(nm, len(names)) for nm in getattr(b, attr_names)] + [-1], dtype=dtype)
+                parts.append(lut[getattr(b, attr_codes)])  # -1 → lut[-1] = -1
+            return np.concatenate(parts), tuple(names)
+
+        src, sources = _remap("source", "sources", np.int32)
+        cat, categories = _remap("category", "categories", np.int16)
+        cols = {}
+        for name in STR_COLUMNS:
+            vals = [getattr(b, name) for b in batches]
+            if any(_is_arrow(v) for v in vals):
+                import pyarrow as pa  # type: ignore
+                cols[name] = pa.concat_arrays([v if _is_arrow(v) else pa.array(v.tolist(), pa.string()) for v in vals])
+            else:
+                cols[name] = np.concatenate(vals)
+        return cls(cols["title"], cols["link"], cols["desc"], np.concatenate([b.ts for b in batches]),
+                   src, cat, sources, categories)
+
+    # ----- 기본 동작 -----
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __repr__(self) -> str:
+        return f"NewsBatch(n={len(self)}, sources={len(self.sources)}, categories={self.categories})"
+
+    def _select(self, idx) -> "NewsBatch":
+        """slice → 뷰(zero-copy), 정수 배열/불리언 마스크 → 선택 복사"""
+        if isinstance(idx, slice):
+            sl = lambda c: c[idx]
+        else:
+            idx = np.asarray(idx)
+            if idx.dtype == bool:
+                idx = np.flatnonzero(idx)
+            sl = lambda c: _take(c, idx)
+        return NewsBatch(sl(self.title), sl(self.link), sl(self.desc), self.ts[idx],
+                         self.source[idx], self.category[idx], self.sources, self.categories)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return self.row(int(i))
+        return self._select(i)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        get = lambda c: (c[i].as_py() if _is_arrow(c) else c[i])
+        s, c = int(self.source[i]), int(self.category[i])
+        return {
+            "title": get(self.title), "link": get(self.link),
+            "time": format_time(self.ts[i]), "desc": get(self.desc),
+            "source": self.sources[s] if s >= 0 else "",
+            "category": self.categories[c] if c >= 0 else "",
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def column(self, name: str) -> List[str]:
+        """문자열 컬럼(title/link/desc) → list"""
+        if name not in STR_COLUMNS:
+            raise KeyError(name)
+        return _to_list(getattr(self, name))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def texts(self) -> List[str]:
+        """테마/키워드 매칭용 소문자 '제목 설명'"""
+        return [f"{t} {d}".lower() for t, d in zip(self.column("title"), self.column("desc"))]
+
+    # ----- 벡터 연산 -----
+    def filter(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+               category: Optional[str] = None, source: Optional[str] = None) -> "NewsBatch":
+        mask = np.ones(len(self), dtype=bool)
+        if since is not None:
+            mask &= self.ts >= int(since.timestamp())
+        if until is not None:
+            mask &= (self.ts < int(until.timestamp())) & (self.ts != NO_TIME)
+        if category is not None:
+            code = self.categories.index(category) if category in self.categories else -2
+            mask &= self.category == code
+        if source is not None:
+            code = self.sources.index(source) if source in self.sources else -2
+            mask &= self.source == code
+        return self if mask.all() else self._select(mask)
+
+    def sort_by_time(self, descending: bool = True) -> "NewsBatch":
+        """시간순 정렬 (안정 정렬, 시간 없는 기사는 항상 뒤)"""
+        last = np.iinfo(np.int64).max
+        key = np.where(self.ts == NO_TIME, last, -self.ts if descending else self.ts)
+        order = np.argsort(key, kind="stable")
+        return self._select(order)
+
+    def dedupe(self) -> "NewsBatch":
+        """(title, link) 기준 중복 제거, 처음 나온 기사 유지"""
+        seen, keep = set(), np.zeros(len(self), dtype=bool)
+        for i, k in enumerate(zip(self.column("title"), self.column("link"))):
+            if k not in seen:
+                seen.add(k); keep[i] = True
+        return self if keep.all() else self._select(keep)
+
+    def with_category(self, category: str) -> "NewsBatch":
+        return NewsBatch(self.title, self.link, self.desc, self.ts, self.source,
+                         np.zeros(len(self), dtype=np.int16), self.sources, (category,))
+
+    # ----- Arrow / 직렬화 -----
+    def to_arrow(self):
+        import pyarrow as pa  # type: ignore
+        cols = {n: (c if _is_arrow(c) else pa.array(c.tolist(), pa.string()))
+                for n, c in ((n, getattr(self, n)) for n in STR_COLUMNS)}
+        return pa.table({
+            **cols, "ts": self.ts,
+            "source": pa.DictionaryArray.from_arrays(pa.array(self.source, mask=self.source < 0), list(self.sources) or pa.array([], pa.string())),
+            "category": pa.DictionaryArray.from_arrays(pa.array(self.category.astype(np.int32), mask=self.category < 0), list(self.categories) or pa.array([], pa.string())),
+        })
+
+    @classmethod
+    def from_arrow(cls, table) -> "NewsBatch":
+        """pyarrow Table → Arrow 문자열 컬럼을 그대로 쓰는 NewsBatch"""
+        def _dict(name: str, dtype):
+            col = table.column(name).combine_chunks()
+            codes = np.asarray(col.indices.fill_null(-1).to_numpy(zero_copy_only=False), dtype=dtype)
+            return codes, tuple(col.dictionary.to_pylist())
+        src, sources = _dict("source", np.int32)
+        cat, categories = _dict("category", np.int16)
+        return cls(*(table.column(n).combine_chunks() for n in STR_COLUMNS),
+                   table.column("ts").to_numpy(), src, cat, sources, categories)
+
+    def __getstate__(self):
+        return {
+            "cols": {n: _pack(getattr(self, n)) for n in STR_COLUMNS},
+            "ts": self.ts, "source": self.source, "category": self.category,
+            "sources": self.sources, "categories": self.categories,
+        }
+
+    def __setstate__(self, st):
+        for n in STR_COLUMNS:
+            setattr(self, n, _unpack(*st["cols"][n]))
+        self.ts, self.source, self.category = st["ts"], st["source"], st["category"]
+        self.sources, self.categories = st["sources"], st["categories"]
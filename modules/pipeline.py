@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# modules/pipeline.py
+# 뉴스 → 테마 감지 → 유망종목 → 저장 파이프라인 (Streamlit 없이 실행)
+
+from __future__ import annotations
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+from modules import market, metrics, news
+from modules.ai_logic import (
+    EXPORT_FORMATS, export_report_and_picks, make_theme_report, pick_promising_by_theme_once,
+)
+
+
+# run_pipeline 단계 이름 (timings 키 · pipeline_stage_seconds{stage} 라벨, 실행 순서)
+STAGES = ("fetch", "detect", "quotes", "indicators", "score", "export")
+
+
+class PipelineError(RuntimeError):
+    """파이프라인이 결과를 만들지 못한 경우 (빈 뉴스/테마 등)"""
+
+
+def _upstream_snapshot() -> Counter:
+    return news.UPSTREAM_CALLS + market.UPSTREAM_CALLS
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - t0
+        metrics.observe("pipeline_stage_seconds", timings[name], stage=name)
+
+
+def _record_history(theme_rows) -> None:
+    # 백테스트용 일별 테마 건수 (data/analysis.db theme_daily) - 실패해도 리포트는 계속
+    try:
+        from modules.backtest import record_theme_counts
+        record_theme_counts(theme_rows)
+    except Exception:
+        pass
+
+
+def run_pipeline(days: int = 3, per_cat: int = 100, top_n: int = 5,
+                 out_dir: str = "reports", prefix: str = "batch",
+                 formats: Tuple[str, ...] = EXPORT_FORMATS, workers: int = 8,
+                 record_history: bool = True) -> Dict[str, Any]:
+    """
+    전체 파이프라인 1회 실행. record_history=True면 오늘 테마 건수를 백테스트 이력으로 저장.
+    반환: {"paths", "timings"(초), "upstream_calls", "news", "themes", "picks"}
+    """
+    timings: Dict[str, float] = {}
+    calls0 = _upstream_snapshot()
+
+    with _stage(timings, "fetch"):
+        all_news = news.fetch_all_news(days=days, per_cat=per_cat, workers=workers)
+    if not all_news:
+        raise PipelineError("뉴스를 가져오지 못했습니다. (네트워크 차단/빈 데이터)")
+
+    with _stage(timings, "detect"):
+        theme_rows = news.detect_themes(all_news)
+    if not theme_rows:
+        raise PipelineError("감지된 테마가 없습니다.")
+    if record_history:
+        _record_history(theme_rows)
+
+    with _stage(timings, "quotes"):
+        tickers: List[str] = [t for tr in theme_rows for _, t in news.THEME_STOCKS.get(tr["theme"], [])]
+        quotes = market.fetch_quotes(tickers, workers=workers)
+
+    with _stage(timings, "indicators"):
+        from modules.indicators import safe_indicators  # numpy 지표 엔진은 이 단계에서 로드
+        indicators = safe_indicators()
+
+    with _stage(timings, "score"):
+        theme_df = make_theme_report(theme_rows, news.THEME_STOCKS, quotes=quotes)
+        picks_df = pick_promising_by_theme_once(theme_rows, news.THEME_STOCKS, top_n=top_n, quotes=quotes,
+                                                indicators=indicators)
+
+    with _stage(timings, "export"):
+        paths = export_report_and_picks(theme_df, picks_df, out_dir=out_dir, prefix=prefix, formats=formats)
+
+    calls = _upstream_snapshot()
+    calls.subtract(calls0)
+    return {
+        "paths": paths,
+        "timings": timings,
+        "upstream_calls": {k: v for k, v in calls.items() if v > 0},
+        "news": len(all_news),
+        "themes": len(theme_rows),
+        "picks": len(picks_df),
+    }
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# modules/singleflight.py
+# 동시 요청 합치기 (single-flight): 같은 키로 동시에 들어온 호출은 진행 중인 1건의 결과를 공유
+#
+#   flight = SingleFlight("quotes")
+#   flight.do(key, fn, *args, timeout=30)          # 스레드(풀) 호출자
+#   await flight.do_async(key, fn, *args)           # asyncio 호출자 (리더는 기본 executor에서 실행)
+#
+# - 첫 호출자(리더)가 fn을 실행, 나머지(팔로워)는 같은 Future를 기다린다
+# - 리더의 예외는 그 시점에 기다리던 팔로워 모두에게 그대로 전달 (재시도하지 않음)
+# - timeout은 대기 한도 → FlightTimeout. 리더 실행은 중단하지 않는다 (fn 자체의 HTTP timeout에 맡김)
+# - 끝난 호출은 즉시 제거 → 결과 재사용(캐시)은 modules.cache 몫
+
+from __future__ import annotations
+import functools
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from modules import metrics
+
+# 팔로워 기본 대기 한도(초) - 캐시 래퍼(@cached)가 사용
+DEFAULT_TIMEOUT = float(os.environ.get("NEWS_SINGLEFLIGHT_TIMEOUT", "30"))
+
+
+class FlightTimeout(TimeoutError):
+    """팔로워가 timeout 안에 리더 결과를 받지 못함 (스레드/asyncio 공통)"""
+
+
+class SingleFlight:
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._calls: Dict[Hashable, Any] = {}  # key → concurrent.futures.Future
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _join(self, key: Hashable):
+        """→ (future, 리더 여부)"""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                metrics.inc("singleflight_calls_total", group=self.name, role="follower")
+                return fut, False
+            from concurrent.futures import Future  # logging까지 끌려와 import 비용이 커서 첫 사용 때 로드
+            fut = Future()
+            fut.set_running_or_notify_cancel()  # 팔로워의 취소(asyncio 타임아웃 등)가 공유 Future를 취소하지 못하게
+            self._calls[key] = fut
+        metrics.inc("singleflight_calls_total", group=self.name, role="leader")
+        return fut, True
+
+    def _lead(self, key: Hashable, fut, fn: Callable, args: tuple, kwargs: dict) -> None:
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                if self._calls.get(key) is fut:
+                    del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        fut, leader = self._join(key)
+        if leader:
+            self._lead(key, fut, fn, args, kwargs)
+            return fut.result()
+        from concurrent.futures import TimeoutError as FutureTimeout  # 3.11 미만에서는 내장 TimeoutError와 별개
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            metrics.inc("singleflight_timeouts_total", group=self.name)
+            raise FlightTimeout(f"{self.name}: {timeout}s 안에 진행 중 요청이 끝나지 않음") from None
+
+    async def do_async(self, key: Hashable, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        fn은 블로킹 함수. 리더면 이벤트 루프의 기본 executor에서 실행하고, 대기는 스레드를 점유하지 않는다.
+        timeout은 리더/팔로워 모두의 대기 한도 (실행 자체는 계속되어 다른 대기자에게 결과가 간다).
+        """
+        import asyncio
+        fut, leader = self._join(key)
+        if leader:
+            asyncio.get_running_loop().run_in_executor(None, self._lead, key, fut, fn, args, kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(fut), timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("singleflight_timeouts_total", group=self.name)
+            raise FlightTimeout(f"{self.name}: {timeout}s 안에 진행 중 요청이 끝나지 않음") from None
+
+
+def single_flight(name: str, timeout: Optional[float] = None):
+    """
+    @single_flight("analyzer") - 같은 인자로 동시에 들어온 호출을 합친다 (키는 cache.make_key와 같은 규칙).
+    wrapper.aio(*args, **kwargs): asyncio용 코루틴.
+    """
+    flight = SingleFlight(name)
+
+    def deco(fn):
+        from modules.cache import make_key
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flight.do(make_key(fn, args, kwargs), fn, *args, timeout=timeout, **kwargs)
+
+        async def aio(*args, **kwargs):
+            return await flight.do_async(make_key(fn, args, kwargs), fn, *args, timeout=timeout, **kwargs)
+
+        wrapper.aio = aio  # type: ignore[attr-defined]
+        wrapper.flight = flight  # type: ignore[attr-defined]
+        return wrapper
+    return deco
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+# modules/snapshot_api.py
+# 공유 스냅샷 JSON API (여러 대시보드 인스턴스가 업스트림 대신 이 서비스를 조회)
+#
+#   python cli.py serve --port 8765
+#
+#   GET /v1/snapshot/<key>     key: ticker | quotes | news/all | news/<카테고리> | themes | picks
+#                              ETag/If-None-Match → 304, Accept-Encoding: gzip 지원
+#   GET /v1/changes?since=V&timeout=25   롱폴링: V 이후 바뀐 key 목록
+#   GET /v1/events                       SSE: 스냅샷 변경 알림 (Last-Event-ID 지원)
+#   GET /healthz
+
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from modules import metrics
+from modules.market import build_ticker_items, fetch_quotes
+from modules.news import CATEGORIES, THEME_STOCKS, detect_themes, fetch_all_news, fetch_category_news
+
+# key별 TTL (초)
+TTLS: Dict[str, float] = {"ticker": 30, "quotes": 30, "news": 600, "themes": 600, "picks": 60}
+GZIP_MIN_BYTES = 512
+LONGPOLL_MAX_S = 60.0
+SSE_HEARTBEAT_S = 15.0
+
+
+class Snapshot:
+    __slots__ = ("key", "version", "etag", "etag_gz", "body", "gz", "updated", "data")
+
+    def __init__(self, key: str, version: int, data: Any):
+        self.key, self.version, self.data = key, version, data
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        self.gz = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_BYTES else None
+        self.etag_gz = self.etag[:-1] + '-gz"'  # 표현(인코딩)별로 다른 strong ETag (RFC 9110 8.8.3)
+        self.updated = time.time()
+
+
+class SnapshotStore:
+    """key → 최신 스냅샷. 내용이 바뀔 때만 버전을 올리고 대기 중인 구독자를 깨운다."""
+
+    def __init__(self, producers: Dict[str, Callable[["SnapshotStore"], Any]], ttls: Dict[str, float]):
+        self.producers = producers
+        self.ttls = ttls
+        self.version = 0
+        self._snaps: Dict[str, Snapshot] = {}
+        self._cond = threading.Condition()
+        self._key_locks: Dict[str, threading.Lock] = {k: threading.Lock() for k in producers}
+
+    def ttl(self, key: str) -> float:
+        return self.ttls.get(key, self.ttls.get(key.split("/")[0], 60))
+
+    def peek(self, key: str) -> Optional[Snapshot]:
+        return self._snaps.get(key)
+
+    def put(self, key: str, data: Any) -> Snapshot:
+        with self._cond:
+            old = self._snaps.get(key)
+            snap = Snapshot(key, self.version + 1, data)
+            if old is not None and old.etag == snap.etag:
+                old.updated = snap.updated  # 내용 동일 → 버전 유지, 신선도만 갱신
+                return old
+            self.version += 1
+            self._snaps[key] = snap
+            self._cond.notify_all()
+            return snap
+
+    def get(self, key: str) -> Tuple[Snapshot, bool]:
+        """(스냅샷, stale 여부). 만료 시 key당 한 스레드만 다시 계산, 실패하면 이전 값 제공."""
+        if key not in self.producers:
+            raise KeyError(key)
+        snap = self._snaps.get(key)
+        if snap is not None and time.time() - snap.updated < self.ttl(key):
+            metrics.inc("cache_requests_total", cache="snapshot", result="hit")
+            return snap, False
+        with self._key_locks[key]:
+            snap = self._snaps.get(key)
+            if snap is not None and time.time() - snap.updated < self.ttl(key):
+                metrics.inc("cache_requests_total", cache="snapshot", result="hit")
+                return snap, False
+            metrics.inc("cache_requests_total", cache="snapshot", result="miss")
+            try:
+                return self.put(key, self.producers[key](self)), False
+            except Exception:
+                if snap is None:
+                    raise
+                return snap, True
+
+    def data(self, key: str) -> Any:
+        return self.get(key)[0].data
+
+    def changes(self, since: int, timeout: float) -> Tuple[int, List[str]]:
+        """since 이후 바뀐 key 목록 (없으면 timeout까지 대기)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > since, timeout=max(0.0, timeout))
+            keys = [k for k, s in self._snaps.items() if s.version > since]
+            return self.version, keys
+
+    def refresh_all(self) -> None:
+        for key in self.producers:
+            try:
+                self.get(key)
+            except Exception:
+                continue
+
+
+# ----- 스냅샷 생산자 -----
+def _all_tickers() -> List[str]:
+    return list(dict.fromkeys(t for stocks in THEME_STOCKS.values() for _, t in stocks))
+
+
+def _picks(store: SnapshotStore):
+    from modules.ai_logic import pick_promising_by_theme_once
+    quotes = {t: tuple(q) for t, q in store.data("quotes").items()}
+    from modules.indicators import safe_indicators
+    df = pick_promising_by_theme_once(store.data("themes"), THEME_STOCKS, top_n=5, quotes=quotes,
+                                      indicators=safe_indicators())
+    return json.loads(df.to_json(orient="records", force_ascii=False))  # NaN→null, numpy → 기본형
+
+
+def default_producers(days: int = 3, per_cat: int = 100, workers: int = 8) -> Dict[str, Callable[[SnapshotStore], Any]]:
+    producers: Dict[str, Callable[[SnapshotStore], Any]] = {
+        "ticker": lambda s: build_ticker_items(),
+        "quotes": lambda s: fetch_quotes(_all_tickers(), workers=workers),
+        "news/all": lambda s: fetch_all_news(days=days, per_cat=per_cat, workers=workers).to_records(),
+        "themes": lambda s: detect_themes(s.data("news/all")),
+        "picks": _picks,
+    }
+    for cat in CATEGORIES:
+        producers[f"news/{cat}"] = (lambda c: lambda s: fetch_category_news(c, days=days, max_items=per_cat, workers=workers).to_records())(cat)
+    return producers
+
+
+# ----- HTTP -----
+def _make_handler(store: SnapshotStore):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):  # 접근 로그 생략
+            pass
+
+        def _send(self, code: int, body: bytes = b"", ctype: str = "application/json; charset=utf-8",
+                  headers: Optional[Dict[str, str]] = None):
+            self.send_response(code)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            if code != 304:
+                self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _json(self, code: int, obj: Any):
+            self._send(code, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+        def do_GET(self):
+            u = urlparse(self.path)
+            qs = parse_qs(u.query)
+            path = unquote(u.path)
+            if path == "/healthz":
+                return self._json(200, {"ok": True, "version": store.version})
+            if path == "/v1/keys":
+                return self._json(200, sorted(store.producers))
+            if path.startswith("/v1/snapshot/"):
+                return self._snapshot(path[len("/v1/snapshot/"):])
+            if path == "/v1/changes":
+                try:
+                    since = int((qs.get("since") or ["0"])[0])
+                    timeout = min(float((qs.get("timeout") or ["25"])[0]), LONGPOLL_MAX_S)
+                except ValueError:
+                    return self._json(400, {"error": "since/timeout must be numbers"})
+                version, keys = store.changes(since, timeout)
+                return self._json(200, {"version": version, "keys": keys})
+            if path == "/v1/events":
+                return self._events()
+            self._json(404, {"error": "not found"})
+
+        do_HEAD = do_GET
+
+        def _snapshot(self, key: str):
+            try:
+                snap, stale = store.get(key)
+            except KeyError:
+                return self._json(404, {"error": f"unknown key: {key}"})
+            except Exception as e:
+                return self._json(503, {"error": f"{type(e).__name__}: {e}"})
+            use_gz = snap.gz is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+            headers = {
+                "ETag": snap.etag_gz if use_gz else snap.etag,
+                "X-Snapshot-Version": str(snap.version),
+                "Cache-Control": f"max-age={int(store.ttl(key))}",
+                "Vary": "Accept-Encoding",
+            }
+            if stale:
+                headers["X-Snapshot-Stale"] = "1"
+            if use_gz:
+                headers["Content-Encoding"] = "gzip"
+            # 어느 표현의 ETag든 내용은 같으므로 304 (클라이언트가 인코딩을 바꿔 요청해도 재전송 없음)
+            inm = {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}
+            if snap.etag in inm or snap.etag_gz in inm:
+                headers.pop("Content-Encoding", None)
+                return self._send(304, headers=headers)
+            self._send(200, snap.gz if use_gz else snap.body, headers=headers)
+
+        def _events(self):
+            try:
+                since = int(self.headers.get("Last-Event-ID") or (parse_qs(urlparse(self.path).query).get("since") or [store.version])[0])
+            except ValueError:
+                since = store.version
+            since = min(since, store.version)  # 서버 재시작 후 이전 ID로 재접속한 경우
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            if self.command == "HEAD":
+                return
+            try:
+                while True:
+                    version, keys = store.changes(since, SSE_HEARTBEAT_S)
+                    if not keys and version == since:
+                        self.wfile.write(b": ping\n\n")
+                    for k in keys:
+                        s = store.peek(k)
+                        data = json.dumps({"key": k, "version": s.version, "etag": s.etag}, ensure_ascii=False)
+                        self.wfile.write(f"id: {s.version}\nevent: snapshot\ndata: {data}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    since = version
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, refresh: float = 30.0,
+          store: Optional[SnapshotStore] = None, block: bool = True):
+    """스냅샷 API 서버 기동. refresh>0 이면 백그라운드에서 만료된 스냅샷을 미리 갱신(→ 변경 알림)."""
+    from http.server import ThreadingHTTPServer
+
+    store = store or SnapshotStore(default_producers(), TTLS)
+    server = ThreadingHTTPServer((host, int(port)), _make_handler(store))
+    server.daemon_threads = True
+    server.store = store  # type: ignore[attr-defined]
+
+    if refresh > 0:
+        def _loop():
+            while True:
+                store.refresh_all()
+                time.sleep(refresh)
+        threading.Thread(target=_loop, name="snapshot-refresh", daemon=True).start()
+
+    if block:
+        server.serve_forever()
+    else:
+        threading.Thread(target=server.serve_forever, name="snapshot-http", daemon=True).start()
+    return server
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# modules/snapshot_client.py
+# 스냅샷 API 얇은 클라이언트 (ETag 조건부 요청 → 변경 없으면 304로 본문 생략)
+
+from __future__ import annotations
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from modules import metrics
+
+
+class SnapshotClient:
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()  # keep-alive, gzip 자동 해제
+        self._cache: Dict[str, Tuple[str, Any]] = {}  # key → (etag, data)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        url = f"{self.base_url}/v1/snapshot/{quote(key, safe='/')}"
+        with self._lock:
+            cached = self._cache.get(key)
+        headers = {"Accept-Encoding": "gzip"}
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        with metrics.timer("upstream_request_seconds", inflight="upstream_inflight",
+                           host=self.base_url, provider="snapshot_api"):
+            r = self._session.get(url, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and cached:
+            metrics.inc("cache_requests_total", cache="snapshot_client", result="hit")
+            return cached[1]
+        r.raise_for_status()
+        metrics.inc("cache_requests_total", cache="snapshot_client", result="miss")
+        data = r.json()
+        etag = r.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._cache[key] = (etag, data)
+        return data
+
+    def wait_for_changes(self, since: int, timeout: float = 25.0) -> Tuple[int, List[str]]:
+        """롱폴링: since 이후 바뀐 (version, keys)"""
+        r = self._session.get(f"{self.base_url}/v1/changes", params={"since": since, "timeout": timeout},
+                              timeout=timeout + self.timeout)
+        r.raise_for_status()
+        j = r.json()
+        return int(j["version"]), list(j["keys"])
+
+    # ----- 대시보드에서 쓰는 형태로 -----
+    def ticker_items(self) -> List[Dict[str, Any]]:
+        return self.get("ticker")
+
+    def category_news(self, cat: str) -> List[Dict[str, Any]]:
+        return self.get(f"news/{cat}")
+
+    def all_news(self) -> List[Dict[str, Any]]:
+        return self.get("news/all")
+
+    def themes(self) -> List[Dict[str, Any]]:
+        return self.get("themes")
+
+    def quotes(self) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[int]]]:
+        return {t: tuple(q) for t, q in self.get("quotes").items()}
+
+    def picks(self) -> List[Dict[str, Any]]:
+        return self.get("picks")